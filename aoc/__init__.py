@@ -0,0 +1,15 @@
+# Advent of Code: Shared tooling
+__author__ = "Matteo Golin"
+
+from aoc.answers import Answers
+from aoc.runner import DayResult, PartResult, discover, load_day, run_day, run_days
+
+__all__ = [
+    "Answers",
+    "DayResult",
+    "PartResult",
+    "discover",
+    "load_day",
+    "run_day",
+    "run_days",
+]
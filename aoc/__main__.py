@@ -0,0 +1,53 @@
+# Advent of Code: Runner command line
+__author__ = "Matteo Golin"
+
+# Imports
+import argparse
+
+from aoc.runner import INPUT_PATTERN, DayResult, discover, run_days
+
+
+def format_result(result: DayResult) -> str:
+    """Returns a human-readable summary of the day's results."""
+
+    lines = [f"Day {result.day} ({result.input_file})"]
+    for part in result.parts:
+        answer = "" if part.answer is None else f"{part.answer}"
+        lines.append(f"  {part.name:<6}  wall {part.wall:9.4f}s  cpu {part.cpu:9.4f}s  {answer}")
+
+    if result.error is not None:
+        lines.append(f"  error: {result.error}")
+
+    return "\n".join(lines)
+
+
+# Main
+def main():
+
+    days = discover()
+
+    parser = argparse.ArgumentParser(prog="aoc", description="Runs the selected days' solutions in parallel.")
+    parser.add_argument("days", type=int, nargs="*", help="The days to run. Runs every day if omitted.")
+    parser.add_argument(
+        "-i", "--input",
+        default=INPUT_PATTERN,
+        help="Input file pattern, where {day} is replaced with the day number.",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    selected = args.days or list(days)
+    unknown = [day for day in selected if day not in days]
+    if unknown:
+        parser.error(f"No solution for day(s): {', '.join(map(str, unknown))}")
+
+    results = run_days(selected, args.input, args.workers)
+    for result in results:
+        print(format_result(result))
+
+    # Exit code reflects whether any day failed
+    raise SystemExit(any(result.error is not None for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+# Advent of Code: Puzzle answers
+__author__ = "Matteo Golin"
+
+# Imports
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+# Types
+Part1 = TypeVar("Part1")
+Part2 = TypeVar("Part2")
+
+
+@dataclass
+class Answers(Generic[Part1, Part2]):
+    """The answers to both parts of the puzzle."""
+
+    part_1: Part1
+    part_2: Part2
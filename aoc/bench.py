@@ -0,0 +1,224 @@
+# Advent of Code: Benchmark suite
+__author__ = "Matteo Golin"
+
+# Imports
+import argparse
+import csv
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Iterator
+
+from aoc.generators import GENERATORS, generate
+from aoc.runner import PARTS, discover, load_day, timed
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
+
+# Constants
+UNITS: dict[str, int] = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+DEFAULT_SIZES: list[str] = ["4K", "64K", "1M"]
+DEFAULT_TIMEOUT: float = 60
+
+
+@dataclass
+class Benchmark:
+    """The performance of one stage of a day's solution on a generated input of a given size."""
+
+    day: int
+    size: int
+    name: str
+    wall: float
+    cpu: float
+    throughput: float  # Input bytes per second of wall-clock time
+    peak_memory: int | None  # Peak resident bytes of the process and its workers by the end of the stage, if measured
+    error: str | None = None
+
+
+def parse_size(size: str) -> int:
+
+    """Returns the number of bytes described by a size such as 512, 64K, 10M or 2G."""
+
+    size = size.strip().upper().removesuffix("B")
+    unit = size[-1] if size and size[-1] in UNITS else ""
+    return int(float(size.removesuffix(unit)) * UNITS[unit])
+
+
+def format_size(size: float) -> str:
+
+    """Returns the size in bytes in a human-readable form."""
+
+    for unit in ["", "K", "M"]:
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}G"
+
+
+def input_path(directory: str, day: int, size: int, seed: int) -> str:
+
+    """Returns the path of the generated input, generating it if it does not exist yet."""
+
+    path = os.path.join(directory, f"day{day}-{size}-{seed}.txt")
+    if not os.path.exists(path):
+        generate(day, path, size, seed)
+
+    return path
+
+
+def peak_memory() -> int | None:
+
+    """
+    Returns the peak resident memory of this process, or of the largest of its finished worker processes, in bytes. The
+    pages of memory-mapped input and of shared memory count once they have been read. Returns None if the platform
+    does not report it.
+    """
+
+    if resource is None:
+        return None
+
+    peak = max(resource.getrusage(who).ru_maxrss for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN))
+    return peak if sys.platform == "darwin" else peak * 1024  # Kilobytes everywhere but macOS
+
+
+def benchmark_day(day: int, input_file: str, memory: bool = True) -> Iterator[Benchmark]:
+
+    """
+    Times parsing and each part of the day's solution on the input file. The peak memory is the high-water mark of the
+    process by the end of each stage, so it is only meaningful when the day runs in a fresh process.
+    """
+
+    size = os.path.getsize(input_file)
+    name = "parse"
+    try:
+        module = load_day(day)
+        model, wall, cpu = timed(module.parse, input_file)
+        peak = peak_memory() if memory else None
+        yield Benchmark(day, size, name, wall, cpu, size / wall if wall else 0, peak)
+
+        for name in PARTS:
+            part = getattr(module, name)
+            _, wall, cpu = timed(part, model)
+            peak = peak_memory() if memory else None
+            yield Benchmark(day, size, name, wall, cpu, size / wall if wall else 0, peak)
+
+    # Record where the solver gave up instead of abandoning the rest of the suite
+    except Exception as e:
+        yield Benchmark(day, size, name, 0, 0, 0, None, f"{type(e).__name__}: {e}")
+
+
+def benchmark_worker(results: multiprocessing.Queue, day: int, input_file: str, memory: bool) -> None:
+
+    """Sends each benchmark of the day to the results queue as soon as it is done, followed by None."""
+
+    for result in benchmark_day(day, input_file, memory):
+        results.put(result)
+    results.put(None)
+
+
+def benchmark_isolated(day: int, input_file: str, memory: bool, timeout: float) -> Iterator[Benchmark]:
+
+    """
+    Benchmarks the day in a fresh process, so that runs don't share memory or warm caches. The process is killed if it
+    is still running after the timeout, which is recorded as an error on the stage that was running.
+    """
+
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=benchmark_worker, args=(results, day, input_file, memory))
+    process.start()
+
+    deadline = time.monotonic() + timeout
+    stages = iter(("parse",) + PARTS)
+    try:
+        while True:
+            result = results.get(timeout=max(0.0, deadline - time.monotonic()))
+            if result is None:
+                break
+            next(stages)
+            yield result
+
+    except queue.Empty:
+        process.terminate()
+        size = os.path.getsize(input_file)
+        yield Benchmark(day, size, next(stages, "-"), 0, 0, 0, None, f"Timed out after {timeout:g}s")
+
+    finally:
+        process.join()
+
+
+def format_benchmark(result: Benchmark) -> str:
+
+    """Returns a human-readable line describing the benchmark."""
+
+    if result.error is not None:
+        return f"Day {result.day:>2} {format_size(result.size):>6}  {result.name:<6}  error: {result.error}"
+
+    memory = "" if result.peak_memory is None else f"  peak {format_size(result.peak_memory):>6}"
+    return (
+        f"Day {result.day:>2} {format_size(result.size):>6}  {result.name:<6}  wall {result.wall:9.4f}s  "
+        f"cpu {result.cpu:9.4f}s  {format_size(result.throughput):>6}/s{memory}"
+    )
+
+
+# Main
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="aoc.bench",
+        description="Benchmarks the solutions on generated inputs of increasing size.",
+    )
+    parser.add_argument("days", type=int, nargs="*", help="The days to benchmark. Benchmarks every day if omitted.")
+    parser.add_argument("-s", "--sizes", nargs="+", default=DEFAULT_SIZES, help="Input sizes, such as 64K, 10M or 1G.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the input generators.")
+    parser.add_argument("-d", "--data", default=None, help="Directory to keep the generated inputs in.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip measuring peak memory.")
+    parser.add_argument(
+        "-t", "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Seconds a day may run on one input. Larger inputs are skipped for a day once it times out.",
+    )
+    parser.add_argument("--csv", default=None, help="File to write the results to as CSV.")
+    args = parser.parse_args()
+
+    days = args.days or [day for day in discover() if day in GENERATORS]
+    sizes = sorted(parse_size(size) for size in args.sizes)
+
+    # Generated inputs are only kept when asked to, they can add up to many gigabytes
+    if args.data is None:
+        data_directory = tempfile.TemporaryDirectory(prefix="aoc-bench-")
+    else:
+        os.makedirs(args.data, exist_ok=True)
+        data_directory = nullcontext(args.data)
+
+    results: list[Benchmark] = []
+    with data_directory as data:
+        for day in days:
+            for size in sizes:
+                path = input_path(data, day, size, args.seed)
+                errors = False
+                for result in benchmark_isolated(day, path, not args.no_memory, args.timeout):
+                    print(format_benchmark(result), flush=True)
+                    results.append(result)
+                    errors |= result.error is not None
+
+                # The solver stopped scaling, larger inputs won't fare any better
+                if errors:
+                    break
+
+    if args.csv is not None:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(Benchmark.__dataclass_fields__))
+            writer.writeheader()
+            writer.writerows(asdict(result) for result in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,465 @@
+# Advent of Code: Synthetic puzzle input generators
+__author__ = "Matteo Golin"
+
+# Imports
+import math
+import random
+import string
+from typing import Callable, Iterator, TextIO
+
+# Constants
+BATCH_SIZE: int = 1 << 16  # Number of lines generated at once by the line-based generators
+WRITE_SIZE: int = 1 << 20  # Number of characters buffered before writing to the file
+MAX_CORRIDOR: int = 3  # Broken valves between two working valves at most, so they stay within reach of each other
+Generator = Callable[[int, random.Random], Iterator[str]]
+
+
+def lines_until(size: int, make_batch: Callable[[], list[str]]) -> Iterator[str]:
+
+    """Yields batches of lines until size characters have been yielded, cutting the last batch at a line boundary."""
+
+    written = 0
+    while written < size:
+        chunk = "".join(make_batch())
+
+        # Trim the final batch, keeping at least one line
+        if written + len(chunk) > size:
+            end = chunk.rfind("\n", 0, size - written) + 1 or chunk.find("\n") + 1 or size - written
+            yield chunk[:end]
+            return
+
+        written += len(chunk)
+        yield chunk
+
+
+def calorie_lists(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 1: Calorie counts of each elf, with elves separated by a blank line."""
+
+    written = 0
+    while written < size:
+        elves = []
+        for _ in range(BATCH_SIZE // 8):
+            calories = [str(rng.randint(1000, 70000)) for _ in range(rng.randint(1, 15))]
+            elves.append("\n".join(calories))
+
+        # Every batch after the first starts with the blank line separating it from the previous one
+        chunk = ("\n" if written else "") + "\n\n".join(elves) + "\n"
+
+        # Trim the final batch, keeping at least one elf
+        if written + len(chunk) > size:
+            end = chunk.rfind("\n\n", 0, size - written) + 1 or chunk.find("\n\n") + 1 or len(chunk)
+            yield chunk[:end]
+            return
+
+        written += len(chunk)
+        yield chunk
+
+
+def strategy_guide(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 2: Rounds of rock paper scissors."""
+
+    rounds = [f"{opponent} {player}\n" for opponent in "ABC" for player in "XYZ"]
+    yield from lines_until(size, lambda: rng.choices(rounds, k=BATCH_SIZE))
+
+
+def rucksack(badge: str, pool: list[str], rng: random.Random) -> str:
+
+    """Returns a rucksack containing the badge whose compartments only have one item type in common."""
+
+    # Split the pool so the compartments share nothing but the common item
+    rng.shuffle(pool)
+    common = rng.choice(pool + [badge])
+    remaining = [item for item in pool if item != common]
+    first_pool, second_pool = remaining[:len(remaining) // 2], remaining[len(remaining) // 2:]
+
+    # The badge can only be in the first compartment unless it is the common item
+    first = [common, badge]
+    second = [common]
+    half = rng.randint(4, 16)
+    first += rng.choices(first_pool, k=half - len(first))
+    second += rng.choices(second_pool, k=half - len(second))
+    rng.shuffle(first)
+    rng.shuffle(second)
+
+    return "".join(first) + "".join(second) + "\n"
+
+
+def rucksacks(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 3: Groups of three rucksacks, which only have their badge in common."""
+
+    items = list(string.ascii_letters)
+
+    def make_batch() -> list[str]:
+        batch = []
+        for _ in range(BATCH_SIZE // 3):
+
+            # Every elf in the group gets a disjoint pool of item types
+            badge = rng.choice(items)
+            others = [item for item in items if item != badge]
+            rng.shuffle(others)
+            for elf in range(3):
+                batch.append(rucksack(badge, others[elf::3], rng))
+
+        return batch
+
+    yield from lines_until(size, make_batch)
+
+
+def section_assignments(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 4: Pairs of section assignments."""
+
+    def assignment() -> str:
+        start = rng.randint(1, 99)
+        return f"{start}-{rng.randint(start, 99)}"
+
+    yield from lines_until(size, lambda: [f"{assignment()},{assignment()}\n" for _ in range(BATCH_SIZE)])
+
+
+def crate_stacks(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 5: A drawing of nine crate stacks followed by a rearrangement procedure that never empties a stack."""
+
+    stacks = 9
+    height = max(2, size // 10 // (stacks * 4))  # The drawing takes up roughly a tenth of the input
+    heights = [rng.randint(max(2, height // 2), height) for _ in range(stacks)]
+
+    # Drawing, from the top of the tallest stack down
+    drawing = []
+    for level in range(max(heights) - 1, -1, -1):
+        row = [f"[{rng.choice(string.ascii_uppercase)}]" if heights[i] > level else "   " for i in range(stacks)]
+        drawing.append(" ".join(row) + "\n")
+    drawing.append(" ".join(f" {i + 1} " for i in range(stacks)) + "\n\n")
+
+    drawing = "".join(drawing)
+    yield drawing
+
+    def make_batch() -> list[str]:
+        batch = []
+        for _ in range(BATCH_SIZE):
+            # Always leave at least one crate behind
+            origin = rng.choice([i for i in range(stacks) if heights[i] > 1])
+            destination = rng.choice([i for i in range(stacks) if i != origin])
+            num = rng.randint(1, min(heights[origin] - 1, height))
+            heights[origin] -= num
+            heights[destination] += num
+            batch.append(f"move {num} from {origin + 1} to {destination + 1}\n")
+        return batch
+
+    yield from lines_until(size - len(drawing), make_batch)
+
+
+def signal(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 6: A signal whose start-of-packet and start-of-message markers are at the very end."""
+
+    # Three distinct characters can never form a marker
+    yield from lines_until(size - 15, lambda: rng.choices("abc", k=BATCH_SIZE))
+    yield "abcdefghijklmn\n"
+
+
+def name(rng: random.Random) -> str:
+
+    """Returns a random file or directory name."""
+
+    name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 8)))
+    return name if name != "dir" else "rid"
+
+
+def terminal_output(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 7: Terminal output of a depth-first walk through a random file system."""
+
+    max_depth = 30
+    written = 0
+
+    def listing(depth: int) -> tuple[str, list[str]]:
+        """Returns the output of ls in a new directory, along with the names of its subdirectories."""
+        directories = []
+        if written < size and depth < max_depth:
+            directories = sorted({name(rng) for _ in range(rng.randint(1, 4))})
+
+        files = sorted({name(rng) + rng.choice(["", ".txt", ".dat", ".log"]) for _ in range(rng.randint(0, 6))})
+        lines = ["$ ls\n"] + [f"dir {directory}\n" for directory in directories]
+        lines += [f"{rng.randint(1, 50_000)} {file}\n" for file in files]
+        return "".join(lines), directories
+
+    output, children = listing(0)
+    output = "$ cd /\n" + output
+    written += len(output)
+    yield output
+
+    # Walk the tree iteratively so that deep trees are possible
+    stack: list[list[str]] = [children]
+    while stack:
+        if not stack[-1]:
+            stack.pop()
+            if stack:
+                written += 8
+                yield "$ cd ..\n"
+            continue
+
+        directory = stack[-1].pop()
+        output, children = listing(len(stack))
+        output = f"$ cd {directory}\n" + output
+        written += len(output)
+        yield output
+        stack.append(children)
+
+
+def forest(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 8: A square grid of tree heights."""
+
+    side = max(2, math.isqrt(size))
+    for _ in range(side):
+        yield "".join(rng.choices(string.digits, k=side)) + "\n"
+
+
+def rope_moves(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 9: Random head movements."""
+
+    moves = [f"{direction} {amount}\n" for direction in "RLUD" for amount in range(1, 20)]
+    yield from lines_until(size, lambda: rng.choices(moves, k=BATCH_SIZE))
+
+
+def cpu_program(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 10: A program of noop and addx instructions."""
+
+    instructions = ["noop\n"] + [f"addx {value}\n" for value in range(-15, 16)]
+    yield from lines_until(size, lambda: rng.choices(instructions, k=BATCH_SIZE))
+
+
+def monkeys(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 11: Eight monkeys, each holding an equal share of the items."""
+
+    count = 8
+    tests = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], k=count)
+    operations = ["old * old"] + [f"old * {rng.randint(2, 19)}" for _ in range(3)]
+    operations += [f"old + {rng.randint(1, 8)}" for _ in range(count - len(operations))]
+    rng.shuffle(operations)
+
+    items = max(1, size // count // 4)
+    for monkey in range(count):
+        others = [other for other in range(count) if other != monkey]
+        pass_id, fail_id = rng.sample(others, k=2)
+        yield "\n" if monkey else ""
+        yield f"Monkey {monkey}:\n"
+        yield "  Starting items: " + ", ".join(str(rng.randint(50, 99)) for _ in range(items)) + "\n"
+        yield f"  Operation: new = {operations[monkey]}\n"
+        yield f"  Test: divisible by {tests[monkey]}\n"
+        yield f"    If true: throw to monkey {pass_id}\n"
+        yield f"    If false: throw to monkey {fail_id}\n"
+
+
+def height_map(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 12: A height map that rises from west to east, with a clear path along the middle row."""
+
+    width = max(26, math.isqrt(size))
+    rows = max(1, size // (width + 1))
+    middle = rows // 2
+
+    for y in range(rows):
+        row = []
+        for x in range(width):
+            elevation = x * 26 // width
+            if y != middle:
+                elevation = max(0, elevation - rng.randint(0, 2))
+            row.append(string.ascii_lowercase[elevation])
+
+        if y == middle:
+            row[0] = "S"
+            row[-1] = "E"
+        yield "".join(row) + "\n"
+
+
+def packet(rng: random.Random, depth: int = 0) -> str:
+
+    """Returns a random packet."""
+
+    items = []
+    for _ in range(rng.randint(0, 5)):
+        if depth < 4 and rng.random() < 0.3:
+            items.append(packet(rng, depth + 1))
+        else:
+            items.append(str(rng.randint(0, 10)))
+
+    return "[" + ",".join(items) + "]"
+
+
+def packet_pairs(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 13: Pairs of packets. The input does not end with a new line."""
+
+    written = 0
+    separator = ""
+    while written < size:
+        pair = f"{separator}{packet(rng)}\n{packet(rng)}"
+        separator = "\n\n"
+        written += len(pair)
+        yield pair
+
+
+def rock_paths(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 14: Rock paths scattered below the sand source, over an area that grows with the number of paths."""
+
+    paths = max(1, size // 40)
+    spread = 10 + math.isqrt(paths) * 2
+
+    for _ in range(paths):
+        x = rng.randint(max(0, 500 - spread), 500 + spread)
+        y = rng.randint(2, 2 + spread)
+        points = [(x, y)]
+        for segment in range(rng.randint(1, 4)):
+            if segment % 2:
+                y = max(2, y + rng.randint(-6, 6))
+            else:
+                x = max(0, x + rng.randint(-6, 6))
+            points.append((x, y))
+
+        yield " -> ".join(f"{x},{y}" for x, y in points) + "\n"
+
+
+def sensors(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 15: Sensors in the search area, including one covering all of it so no row is left uncovered."""
+
+    limit = 4_000_000
+    yield f"Sensor at x={limit // 2}, y={limit // 2}: closest beacon is at x={limit * 3 // 2}, y={limit // 2}\n"
+
+    def make_batch() -> list[str]:
+        batch = []
+        for _ in range(BATCH_SIZE // 16):
+            x, y = rng.randint(0, limit), rng.randint(0, limit)
+            dx = rng.randint(-100_000, 100_000)
+            dy = rng.randint(-100_000, 100_000)
+            batch.append(f"Sensor at x={x}, y={y}: closest beacon is at x={x + dx}, y={y + dy}\n")
+        return batch
+
+    yield from lines_until(size, make_batch)
+
+
+def valves(size: int, rng: random.Random) -> Iterator[str]:
+
+    """
+    Day 16: A network of working valves joined by short corridors of broken valves, like the real puzzle input. Valve
+    names are two letters, so the network is capped at 676 valves, of which at most eight are working. Broken valves
+    which don't fit in the corridors are dead ends off the working valves.
+    """
+
+    names = [first + second for first in string.ascii_uppercase for second in string.ascii_uppercase]
+    names.remove("AA")
+    count = min(len(names) + 1, max(2, size // 60))
+    names = ["AA"] + rng.sample(names, k=count - 1)
+
+    # Working valves (and the start) are joined by a random spanning tree, with a few extra tunnels to create loops
+    working = min(8, max(1, count // 5))
+    junctions = names[:working + 1]
+    edges = [(junctions[i], junctions[rng.randrange(i)]) for i in range(1, len(junctions))]
+    edges += [tuple(rng.sample(junctions, k=2)) for _ in range(working // 2)]
+
+    # Broken valves are spread along the tunnels as corridors, and the rest are dead ends off the junctions
+    corridors: list[list[str]] = [[] for _ in edges]
+    broken = names[working + 1:]
+    placed = min(len(broken), MAX_CORRIDOR * len(corridors))
+    for valve in broken[:placed]:
+        rng.choice([corridor for corridor in corridors if len(corridor) < MAX_CORRIDOR]).append(valve)
+
+    branches = [(valve, rng.choice(junctions)) for valve in broken[placed:]]
+
+    tunnels: dict[str, set[str]] = {valve: set() for valve in names}
+    for (start, end), corridor in zip(edges, corridors):
+        path = [start] + corridor + [end]
+        for first, second in zip(path, path[1:]):
+            tunnels[first].add(second)
+            tunnels[second].add(first)
+
+    for first, second in branches:
+        tunnels[first].add(second)
+        tunnels[second].add(first)
+
+    for valve in names:
+        flow = rng.randint(1, 25) if valve in junctions[1:] else 0
+        neighbours = ", ".join(sorted(tunnels[valve]))
+        if len(tunnels[valve]) == 1:
+            yield f"Valve {valve} has flow rate={flow}; tunnel leads to valve {neighbours}\n"
+        else:
+            yield f"Valve {valve} has flow rate={flow}; tunnels lead to valves {neighbours}\n"
+
+
+def jet_pattern(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 17: A pattern of jets pushing left and right."""
+
+    yield from lines_until(size - 1, lambda: rng.choices("<>", k=BATCH_SIZE))
+    yield "\n"
+
+
+def voxels(size: int, rng: random.Random) -> Iterator[str]:
+
+    """Day 18: Cubes filling roughly a quarter of a bounding box that grows with the number of cubes."""
+
+    cubes = max(1, size // 9)
+    side = max(3, round((cubes * 4) ** (1 / 3)))
+
+    def make_batch() -> list[str]:
+        return [f"{rng.randrange(side)},{rng.randrange(side)},{rng.randrange(side)}\n" for _ in range(BATCH_SIZE)]
+
+    yield from lines_until(size, make_batch)
+
+
+GENERATORS: dict[int, Generator] = {
+    1: calorie_lists,
+    2: strategy_guide,
+    3: rucksacks,
+    4: section_assignments,
+    5: crate_stacks,
+    6: signal,
+    7: terminal_output,
+    8: forest,
+    9: rope_moves,
+    10: cpu_program,
+    11: monkeys,
+    12: height_map,
+    13: packet_pairs,
+    14: rock_paths,
+    15: sensors,
+    16: valves,
+    17: jet_pattern,
+    18: voxels,
+}
+
+
+def write_input(day: int, file: TextIO, size: int, seed: int = 0) -> None:
+
+    """Writes a puzzle input of roughly size characters for the day. The same seed always produces the same input."""
+
+    rng = random.Random(f"{day}:{seed}")
+    buffer: list[str] = []
+    buffered = 0
+    for chunk in GENERATORS[day](size, rng):
+        buffer.append(chunk)
+        buffered += len(chunk)
+
+        if buffered >= WRITE_SIZE:
+            file.write("".join(buffer))
+            buffer = []
+            buffered = 0
+
+    file.write("".join(buffer))
+
+
+def generate(day: int, path: str, size: int, seed: int = 0) -> None:
+
+    """Writes a puzzle input of roughly size bytes for the day to the path."""
+
+    with open(path, "w", newline="\n") as file:
+        write_input(day, file, size, seed)
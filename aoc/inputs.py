@@ -0,0 +1,192 @@
+# Advent of Code: Puzzle input sources
+__author__ = "Matteo Golin"
+
+# Imports
+import io
+import mmap
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, TypeAlias
+
+# Types
+# A path to the puzzle input, the raw puzzle input itself, or an open file to read it from
+Source: TypeAlias = str | os.PathLike | bytes | bytearray | memoryview | IO
+
+# The puzzle input as raw bytes. Slicing either kind returns bytes, and both can be searched without copying
+Buffer: TypeAlias = bytes | bytearray | mmap.mmap
+
+# Constants
+LINE: bytes = b"\n"
+CRLF: bytes = b"\r\n"
+BLANK_LINE: bytes = b"\n\n"
+SPAN_SIZE: int = 1 << 20
+
+
+def read_text(source: Source) -> str:
+
+    """Returns the whole puzzle input as text, with new lines as line endings."""
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source).decode().replace("\r\n", "\n")
+
+    if isinstance(source, io.IOBase):
+        text = source.read()
+        return (text.decode() if isinstance(text, bytes) else text).replace("\r\n", "\n")
+
+    with open(source, "r") as file:
+        return file.read()
+
+
+def read_lines(source: Source) -> Iterator[str]:
+
+    """Yields each line of the puzzle input as text, including its new line character."""
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield from read_text(source).splitlines(keepends=True)
+
+    elif isinstance(source, io.IOBase):
+        for line in source:
+            yield (line.decode() if isinstance(line, bytes) else line).replace("\r\n", "\n")
+
+    else:
+        with open(source, "r") as file:
+            yield from file
+
+
+def map_file(file: IO) -> mmap.mmap | bytes:
+
+    """Returns the open file memory-mapped for reading, or its contents if it cannot be mapped."""
+
+    try:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""  # Empty files cannot be mapped
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # Pipes, sockets and in-memory files
+    except (OSError, ValueError, io.UnsupportedOperation):
+        contents = file.read()
+        return contents.encode() if isinstance(contents, str) else contents
+
+
+@contextmanager
+def open_input(source: Source) -> Iterator[Buffer]:
+
+    """
+    Opens the puzzle input as a buffer of bytes. Files are memory-mapped rather than read, so only the pages being
+    parsed need to be in memory, and raw input passed in as bytes is used as is.
+    """
+
+    if isinstance(source, (bytes, bytearray, mmap.mmap)):
+        yield source
+
+    elif isinstance(source, memoryview):
+        yield source.tobytes()
+
+    elif isinstance(source, io.IOBase):
+        buffer = map_file(source)
+        try:
+            yield buffer
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+
+    else:
+        with open(source, "rb") as file:
+            buffer = map_file(file)
+            try:
+                yield buffer
+            finally:
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+
+
+def line_ending(buffer: Buffer) -> bytes:
+
+    """Returns the line ending used by the buffer, decided by its first line."""
+
+    end = buffer.find(LINE)
+    return CRLF if end > 0 and buffer[end - 1] == CRLF[0] else LINE
+
+
+def native_separator(buffer: Buffer, separator: bytes) -> bytes:
+
+    """Returns the separator with its new lines written as the line endings of the buffer."""
+
+    if LINE not in separator or CRLF in separator:
+        return separator
+
+    return separator.replace(LINE, line_ending(buffer))
+
+
+def read_span(buffer: Buffer, start: int = 0, end: int | None = None) -> bytes:
+
+    """
+    Returns the bytes between start and end with new lines as line endings. Windows line endings are only translated
+    in the range that is read, so the rest of the buffer is never copied.
+    """
+
+    span = buffer[start:end]
+    return span.replace(CRLF, LINE) if line_ending(buffer) == CRLF else span
+
+
+def records(buffer: Buffer, separator: bytes, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+
+    """
+    Yields each record between start and end, split on the separator. Only one record is copied out of the buffer at a
+    time, and a trailing separator does not produce an empty final record. New lines in the separator match the line
+    endings of the buffer, so records never keep a carriage return from a Windows line ending.
+    """
+
+    separator = native_separator(buffer, separator)
+    end = len(buffer) if end is None else end
+    while start < end:
+        stop = buffer.find(separator, start, end)
+        if stop == -1:
+            stop = end
+
+        yield buffer[start:stop]
+        start = stop + len(separator)
+
+
+def spans(
+    buffer: Buffer, separator: bytes, size: int = SPAN_SIZE, start: int = 0, end: int | None = None
+) -> Iterator[tuple[int, int]]:
+
+    """
+    Yields consecutive (start, stop) byte ranges of the buffer of at least the given size, each ending just after a
+    separator (or at the end), so that no record separated by it is split between two ranges. New lines in the
+    separator match the line endings of the buffer.
+    """
+
+    separator = native_separator(buffer, separator)
+    end = len(buffer) if end is None else end
+    while start < end:
+        stop = buffer.find(separator, min(start + size, end), end)
+        stop = end if stop == -1 else stop + len(separator)
+
+        yield start, stop
+        start = stop
+
+
+def lines(buffer: Buffer, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+
+    """Yields each line between start and end, without its line ending."""
+
+    return records(buffer, LINE, start, end)
+
+
+def blocks(buffer: Buffer, start: int = 0, end: int | None = None) -> Iterator[bytes]:
+
+    """
+    Yields each block of lines between start and end separated by blank lines, without trailing line endings. The lines
+    within a block are separated by new lines, whatever the line endings of the buffer.
+    """
+
+    end = len(buffer) if end is None else end
+    while end > start and buffer[end - 1] in CRLF:
+        end -= 1
+
+    if line_ending(buffer) == CRLF:
+        return (block.replace(CRLF, LINE) for block in records(buffer, BLANK_LINE, start, end))
+
+    return records(buffer, BLANK_LINE, start, end)
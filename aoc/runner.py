@@ -0,0 +1,119 @@
+# Advent of Code: Solver runner
+__author__ = "Matteo Golin"
+
+# Imports
+import importlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Iterable
+
+# Constants
+ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_DIRECTORY = re.compile(r"^day(\d+)$")
+INPUT_PATTERN: str = os.path.join(ROOT, "day{day}", "input.txt")
+PARTS: tuple[str, ...] = ("part_1", "part_2")
+
+
+@dataclass
+class PartResult:
+    """The answer of one stage of a day's solution, along with the time it took."""
+
+    name: str
+    answer: Any
+    wall: float
+    cpu: float
+
+
+@dataclass
+class DayResult:
+    """The results of running every stage of a day's solution on one input."""
+
+    day: int
+    input_file: str
+    parts: list[PartResult] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def wall(self) -> float:
+        """Returns the total wall-clock time spent on the day."""
+        return sum(part.wall for part in self.parts)
+
+    @property
+    def cpu(self) -> float:
+        """Returns the total CPU time spent on the day."""
+        return sum(part.cpu for part in self.parts)
+
+
+def discover(root: str = ROOT) -> dict[int, str]:
+    """Returns the module name of every day's solution in the repository, keyed by day number. Nothing is imported."""
+
+    days: dict[int, str] = {}
+    for entry in os.listdir(root):
+        match = DAY_DIRECTORY.match(entry)
+        if match and os.path.isfile(os.path.join(root, entry, f"{entry}.py")):
+            days[int(match.group(1))] = f"{entry}.{entry}"
+
+    return dict(sorted(days.items()))
+
+
+def load_day(day: int) -> ModuleType:
+    """Imports the solution module of the day. Modules are only imported once they are selected to run."""
+
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+    return importlib.import_module(f"day{day}.day{day}")
+
+
+def timed(function: Callable, *args: Any) -> tuple[Any, float, float]:
+    """Returns the result of the function call, along with the wall-clock and CPU time it took."""
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = function(*args)
+
+    return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def run_day(day: int, input_file: str) -> DayResult:
+    """Parses the input file with the day's solution and times each of its parts."""
+
+    result = DayResult(day, input_file)
+    try:
+        module = load_day(day)
+
+        # Parsing is timed on its own so that it is not charged to the first part
+        model, wall, cpu = timed(module.parse, input_file)
+        result.parts.append(PartResult("parse", None, wall, cpu))
+
+        for name in PARTS:
+            answer, wall, cpu = timed(getattr(module, name), model)
+            result.parts.append(PartResult(name, answer, wall, cpu))
+
+    # A failing day should not take the other days down with it
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    return result
+
+
+def run_days(days: Iterable[int], input_pattern: str = INPUT_PATTERN, workers: int | None = None) -> list[DayResult]:
+    """
+    Runs the selected days in parallel across a process pool and returns their results in the order the days were
+    given. The input file of each day is found by formatting the input pattern with the day number.
+    """
+
+    days = list(days)
+    input_files = [input_pattern.format(day=day) for day in days]
+
+    # Don't bother spinning up processes for a single worker
+    if workers == 1 or len(days) <= 1:
+        return [run_day(day, input_file) for day, input_file in zip(days, input_files)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_day, days, input_files))
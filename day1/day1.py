@@ -1,58 +1,117 @@
 # Advent of Code: Day 1
 __author__ = "Matteo Golin"
 
+# Imports
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from typing import Iterator
+
+from aoc.answers import Answers
+from aoc.inputs import BLANK_LINE, SPAN_SIZE, Buffer, Source, native_separator, open_input, spans
+
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+TOP_ELVES: int = 3
+RANGES_PER_WORKER: int = 4  # Extra ranges let idle workers pick up the slack from slower ones
+
+
+def calorie_totals(buffer: Buffer, start: int = 0, end: int | None = None) -> Iterator[int]:
+
+    """Yields the total calories carried by each elf between start and end, reading a span of elves at a time."""
+
+    blank_line = native_separator(buffer, BLANK_LINE)
+    for span_start, span_end in spans(buffer, BLANK_LINE, start=start, end=end):
+
+        # Each elf is separated by a blank line
+        for elf in buffer[span_start:span_end].split(blank_line):
+            calories = elf.split()
+            if calories:  # The span ends with a separator, leaving an empty elf
+                yield sum(map(int, calories))
+
+
+def range_top_totals(input_file: str | os.PathLike, start: int, end: int, k: int) -> list[int]:
+
+    """Returns the k highest total calories carried by the elves between start and end of the input file."""
+
+    with open_input(input_file) as buffer:
+        return heapq.nlargest(k, calorie_totals(buffer, start, end))
+
+
+def parallel_top_totals(input_file: str | os.PathLike, k: int, workers: int) -> list[int]:
+
+    """
+    Returns the k highest total calories carried by any elf. The input file is split at blank lines into byte ranges,
+    which worker processes reduce to their own top k totals before those are merged.
+    """
+
+    with open_input(input_file) as buffer:
+        range_size = max(len(buffer) // (workers * RANGES_PER_WORKER), SPAN_SIZE)
+        ranges = list(spans(buffer, BLANK_LINE, range_size))
+
+    # Not worth starting any workers
+    if len(ranges) < 2:
+        return range_top_totals(input_file, 0, ranges[0][1] if ranges else 0, k)
+
+    starts, ends = zip(*ranges)
+    with ProcessPoolExecutor(workers) as executor:
+        partials = executor.map(range_top_totals, repeat(input_file), starts, ends, repeat(k))
+        return heapq.nlargest(k, chain.from_iterable(partials))
+
+
+def parse(source: Source, k: int = TOP_ELVES, workers: int = 1) -> list[int]:
+
+    """
+    Returns the k highest total calories carried by any elf, from highest to lowest. Input files are split between the
+    given number of worker processes.
+    """
+
+    if k < 1:
+        raise ValueError(f"At least the top elf is needed, but k was {k}.")
+
+    if workers > 1 and isinstance(source, (str, os.PathLike)):
+        return parallel_top_totals(source, k, workers)
+
+    # Only the k best totals seen so far are kept on a heap while the elves are streamed
+    with open_input(source) as buffer:
+        return heapq.nlargest(k, calorie_totals(buffer))
 
 
 # Main
-def part_1(calorie_totals: list[int]) -> None:
+def part_1(top_totals: list[int]) -> int:
 
     """Code for Part 1"""
 
-    # Determine the maximum sum
-    maximum: int = max(calorie_totals)
-    print(f"The elf carrying the most calories is carrying: {maximum} calories")
+    # The highest total is first
+    return top_totals[0]
 
 
-def part_2(calorie_totals: list[int]) -> None:
+def part_2(top_totals: list[int]) -> int:
 
     """Code for Part 2"""
 
-    top_3: list[int] = sorted(calorie_totals, reverse=True)[0:3]
-    maximum: int = sum(top_3)
+    return sum(top_totals)
 
-    print(f"The sum of the top three elves' calories is {maximum} calories.")
 
+def solve(top_totals: list[int]) -> Answers[int, int]:
 
-def main():
+    """Returns the answers to both parts of the puzzle."""
 
-    # Read in input
-    with open(INPUT_FILE, 'r') as file:
-        raw_input = file.read()
+    return Answers(part_1(top_totals), part_2(top_totals))
 
-    # Each elf is separated by a new line
-    elf_list: list[str] = raw_input.split("\n\n")
 
-    # Split individual calorie counts
-    elf_calories: list[list[str]] = []
-    for elf in elf_list:
-        elf_calories.append(elf.split("\n"))
-    elf_calories[-1].pop(-1)  # Last item will be empty string because of how split works
+def main(input_file: str = INPUT_FILE):
 
-    # Convert calories to integers and sum them
-    calorie_totals: list[int] = []
-    for elf in elf_calories:
-        elf = [int(calorie) for calorie in elf]
-        calorie_totals.append(sum(elf))
+    answers = solve(parse(input_file))
 
     # Part 1
     # How many total calories is carried by the elf carrying the most calories?
-    part_1(calorie_totals)
+    print(f"The elf carrying the most calories is carrying: {answers.part_1} calories")
 
     # Part 2
     # How many calories total are the top three elves carrying
-    part_2(calorie_totals)
+    print(f"The sum of the top three elves' calories is {answers.part_2} calories.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,67 @@
+# Advent of Code: Day 10 batch program runner
+__author__ = "Matteo Golin"
+
+# Imports
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from aoc.inputs import Source
+from day10.day10 import Frame, decode, read_letters, render, signal_strength, x_trace
+
+# Constants
+PROGRAMS_PER_TASK: int = 16  # Programs sent to a worker at once, so small programs aren't dwarfed by the messaging
+
+
+@dataclass
+class ProgramResult:
+    """What a CPU program computes and draws."""
+
+    signal_strength: int
+    frame: Frame
+    letters: str
+
+
+def run_program(source: Source) -> ProgramResult:
+
+    """Returns the signal strength, the CRT frame and the letters on it for the program."""
+
+    trace = x_trace(decode(source))
+    frame = render(trace)
+    return ProgramResult(signal_strength(trace), frame, read_letters(frame))
+
+
+def run_programs(sources: Iterable[Source], workers: int | None = None) -> Iterator[ProgramResult]:
+
+    """
+    Yields the result of each program, in order, running them in a pool of worker processes. Programs are given as paths
+    or as their raw bytes, which can be sent to the workers.
+    """
+
+    if workers == 1:
+        yield from map(run_program, sources)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(run_program, sources, chunksize=PROGRAMS_PER_TASK)
+
+
+# Main
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="day10.batch",
+        description="Runs many CPU programs at once and reads the letters each one draws on the CRT.",
+    )
+    parser.add_argument("programs", nargs="+", help="Files containing the programs to run.")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes, one per CPU by default.")
+    args = parser.parse_args()
+
+    for program, result in zip(args.programs, run_programs(args.programs, args.workers)):
+        print(f"{os.fspath(program)}: {result.letters} (signal strength {result.signal_strength})", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,202 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate, chain
+from typing import Iterable, Sequence
+
+from aoc.answers import Answers
+from aoc.inputs import LINE, Source, open_input, read_span, spans
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 RECORDED_CYCLES: list[int] = [20, 60, 100, 140, 180, 220]
+SCREEN_WIDTH: int = 40
+SCREEN_HEIGHT: int = 6
+START_X: int = 1
+LIT: str = "▓"
+DARK: str = " "
 Screen = list[list[str]]
+Trace = Sequence[int]  # The value of the X register during each cycle, starting with the first
+Frame = int  # The pixels of the CRT screen as bits, the pixel at (x, y) being bit y * SCREEN_WIDTH + x
+
+# Letters are 4 pixels wide with a blank column after each, so 8 of them fit across the screen
+LETTER_WIDTH: int = 4
+LETTER_SPACING: int = 5
+UNKNOWN_LETTER: str = "?"
+GLYPHS: dict[str, str] = {
+    "A": ".##.|#..#|#..#|####|#..#|#..#",
+    "B": "###.|#..#|###.|#..#|#..#|###.",
+    "C": ".##.|#..#|#...|#...|#..#|.##.",
+    "E": "####|#...|###.|#...|#...|####",
+    "F": "####|#...|###.|#...|#...|#...",
+    "G": ".##.|#..#|#...|#.##|#..#|.###",
+    "H": "#..#|#..#|####|#..#|#..#|#..#",
+    "I": ".###|..#.|..#.|..#.|..#.|.###",
+    "J": "..##|...#|...#|...#|#..#|.##.",
+    "K": "#..#|#.#.|##..|#.#.|#.#.|#..#",
+    "L": "#...|#...|#...|#...|#...|####",
+    "O": ".##.|#..#|#..#|#..#|#..#|.##.",
+    "P": "###.|#..#|#..#|###.|#...|#...",
+    "R": "###.|#..#|#..#|###.|#.#.|#..#",
+    "S": ".###|#...|#...|.##.|...#|###.",
+    "U": "#..#|#..#|#..#|#..#|#..#|.##.",
+    "Y": "#...|#...|.#.#|..#.|..#.|..#.",
+    "Z": "####|...#|..#.|.#..|#...|####",
+}
+
+# Opcodes, which are also the number of cycles each instruction takes after the first
+NOOP: int = 0
+ADDX: int = 1
 
 
 # Main
-def crt_display(sprite_pos: int, cycle: int, screen: Screen) -> None:
+@dataclass
+class Program:
+    """A decoded CPU program, with the opcode and the operand of each instruction in their own array."""
+
+    opcodes: bytearray
+    operands: array
+
+    def cycles(self) -> int:
+        """Returns the number of cycles the program takes to run."""
+        return len(self.opcodes) + sum(self.opcodes)
+
+
+def decode_chunk(chunk: bytes) -> tuple[bytes, bytes]:
+
+    """
+    Returns the opcodes of the instructions in the chunk of whole lines, and their operands as 64 bit integers. Every
+    instruction is turned into its operand, 0 for a noop, and the opcode is told apart by the first letter of the line.
+    Blank lines are skipped.
+    """
+
+    operands = chunk.replace(b"addx", b"").replace(b"noop", b"0")
+    if np is not None:
+        operands = np.fromstring(operands, dtype=np.int64, sep=" ")
+        characters = np.frombuffer(chunk, np.uint8)
+        line_ends = characters == ord(LINE)
+        starts = np.flatnonzero(np.append(True, line_ends[:-1]) & ~line_ends)  # First character of each non-empty line
+        return (characters[starts] == ord("a")).astype(np.uint8).tobytes(), operands.tobytes()
+
+    opcodes = bytes(line.startswith(b"a") for line in chunk.splitlines() if line)
+    return opcodes, array("q", map(int, operands.split())).tobytes()
+
+
+def decode(source: Source) -> Program:
+
+    """Returns the program decoded into opcodes and operands, a span of lines at a time."""
+
+    program = Program(bytearray(), array("q"))
+    with open_input(source) as buffer:
+        for start, end in spans(buffer, LINE):
+            opcodes, operands = decode_chunk(read_span(buffer, start, end))
+            program.opcodes += opcodes
+            program.operands.frombytes(operands)
+
+    return program
+
+
+def x_trace(program: Program) -> Trace:
+
+    """
+    Returns the value of the X register during every cycle of the program. An addx only changes X once both of its
+    cycles are over, so each instruction adds its operand in its last cycle, and X during a cycle is the running sum of
+    everything added in the cycles before it.
+    """
+
+    if np is not None:
+        opcodes = np.frombuffer(program.opcodes, np.uint8)
+        completed = np.cumsum(opcodes + 1, dtype=np.int64)  # Cycle after each instruction is over
+        changes = np.zeros(int(completed[-1]) + 1 if len(completed) else 1, np.int64)
+        changes[completed] = np.frombuffer(program.operands, np.int64)
+        changes[0] = START_X
+        return np.cumsum(changes[:-1])
+
+    changes = chain.from_iterable(
+        (operand,) if opcode == NOOP else (0, operand) for opcode, operand in zip(program.opcodes, program.operands)
+    )
+    return list(accumulate(changes, initial=START_X))[:-1]
+
+
+def signal_strength(trace: Trace, cycles: Iterable[int] = RECORDED_CYCLES) -> int:
+
+    """Returns the sum of the signal strengths during the cycles, the cycles after the program ends counting as 0."""
+
+    return sum(cycle * int(trace[cycle - 1]) for cycle in cycles if 0 < cycle <= len(trace))
+
+
+def render(trace: Trace) -> Frame:
+
+    """Returns the frame drawn on the CRT screen while the program runs, one pixel per cycle."""
+
+    # Programs can keep running after the screen is full, the cycles after the last pixel draw nothing
+    pixels = SCREEN_WIDTH * SCREEN_HEIGHT
+    if np is not None:
+        sprites = np.asarray(trace[:pixels], np.int64)
+        lit = np.abs(sprites - np.arange(len(sprites)) % SCREEN_WIDTH) <= 1
+        return int.from_bytes(np.packbits(lit, bitorder="little").tobytes(), "little")
+
+    frame = 0
+    for cycle, sprite in enumerate(trace[:pixels]):
+        if sprite - 1 <= cycle % SCREEN_WIDTH <= sprite + 1:
+            frame |= 1 << cycle
+
+    return frame
 
-    """Updates the CRT screen with the pixels being drawn each cycle."""
 
-    x = cycle % 40
-    y = cycle // 40
+def glyph_key(frame: Frame, left: int) -> int:
 
-    # Skip if nothing is drawn
-    if x not in [sprite_pos - 1, sprite_pos, sprite_pos + 1]:
-        return
+    """Returns the bits of the letter whose leftmost column is at the given x, row after row."""
 
-    # Draw pixel
-    screen[y][x] = "▓"
+    key = 0
+    for y in range(SCREEN_HEIGHT):
+        row = (frame >> (y * SCREEN_WIDTH + left)) & ((1 << LETTER_WIDTH) - 1)
+        key |= row << (y * LETTER_WIDTH)
+
+    return key
+
+
+def glyph_frame(glyph: str) -> Frame:
+
+    """Returns the frame showing only the glyph, in the leftmost letter position."""
+
+    frame = 0
+    for y, row in enumerate(glyph.split("|")):
+        for x, pixel in enumerate(row):
+            if pixel == "#":
+                frame |= 1 << (y * SCREEN_WIDTH + x)
+
+    return frame
+
+
+LETTERS: dict[int, str] = {glyph_key(glyph_frame(glyph), 0): letter for letter, glyph in GLYPHS.items()}
+
+
+def read_letters(frame: Frame) -> str:
+
+    """Returns the letters shown on the screen, with UNKNOWN_LETTER for anything that is not a known letter."""
+
+    return "".join(
+        LETTERS.get(glyph_key(frame, left), UNKNOWN_LETTER) for left in range(0, SCREEN_WIDTH, LETTER_SPACING)
+    )
+
+
+def frame_screen(frame: Frame) -> Screen:
+
+    """Returns the frame as a screen of pixels."""
+
+    return [
+        [LIT if frame >> (y * SCREEN_WIDTH + x) & 1 else DARK for x in range(SCREEN_WIDTH)]
+        for y in range(SCREEN_HEIGHT)
+    ]
 
 
 def show_screen(screen: Screen) -> None:
@@ -30,77 +205,52 @@ def show_screen(screen: Screen) -> None:
     """Prints the screen."""
 
     for row in screen:
-        for pixel in row:
-            print(pixel, end="")
-        print()
+        print("".join(row))
 
 
-def main():
+def parse(source: Source) -> Trace:
 
-    # Read input
-    with open(INPUT_FILE, 'r') as file:
-        operations: list[str] = file.read().split("\n")[:-1]  # Empty final line
-    operations2 = operations.copy()
+    """Returns the value of the X register during every cycle of the CPU program."""
 
-    # Part 1
-    # What is the sum of the six key signal strengths
+    return x_trace(decode(source))
 
-    # Start operations
-    x_register = 1
-    program_counter = 1
-    waiting = 0
-    signal_strengths = []
 
-    while operations or waiting:
+def part_1(trace: Trace) -> int:
 
-        # Catch the important cycles
-        if program_counter in RECORDED_CYCLES:
-            signal_strengths.append(program_counter * x_register)
+    """Returns the sum of the six key signal strengths."""
 
-        if not waiting:
-            operation = operations.pop(0)  # Operation marked as complete
+    return signal_strength(trace)
 
-        # Increment X register
-        if "addx" in operation:
-            if waiting == 1:
-                waiting = 0
-                x_register += int(operation.split(" ")[1])
-            else:
-                waiting += 1
 
-        program_counter += 1
+def part_2(trace: Trace) -> str:
 
-    print(f"The sum of the 6 key signal strengths is {sum(signal_strengths)}.")
+    """Returns the 8 capital letters drawn on the CRT screen by the operations."""
 
-    # Part 2
-    # What 8 capital letters appear on the CRT screen
+    return read_letters(render(trace))
 
-    # Create screen
-    screen: Screen = [[" " for _ in range(40)] for _ in range(6)]
 
-    # Perform operations
-    x_register = 1
-    waiting = 0
-    program_counter = 0
-    while operations2 or waiting:
+def solve(trace: Trace) -> Answers[int, str]:
 
-        crt_display(x_register, program_counter, screen)
+    """Returns the answers to both parts of the puzzle."""
 
-        if not waiting:
-            operation = operations2.pop(0)  # Operation marked as complete
+    return Answers(part_1(trace), part_2(trace))
 
-        # Increment X register
-        if "addx" in operation:
-            if waiting == 1:
-                waiting = 0
-                x_register += int(operation.split(" ")[1])
-            else:
-                waiting += 1
 
-        program_counter += 1
+def main(input_file: str = INPUT_FILE):
 
+    # Read input
+    trace = parse(input_file)
+    answers = solve(trace)
+
+    # Part 1
+    # What is the sum of the six key signal strengths
+    print(f"The sum of the 6 key signal strengths is {answers.part_1}.")
+
+    # Part 2
+    # What 8 capital letters appear on the CRT screen
     print("\nThe CRT screen output is:\n")
-    show_screen(screen)
+    show_screen(frame_screen(render(trace)))
+    print(f"\nThe letters on the CRT screen are {answers.part_2}.")
 
 
 if __name__ == '__main__':
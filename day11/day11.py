@@ -3,11 +3,24 @@ __author__ = "Matteo Golin"
 
 # Imports
 from typing import Self, Callable
+from functools import partial
 import operator
-from progress.bar import Bar
+import os
+
+from aoc.answers import Answers
+from aoc.inputs import Source, blocks, open_input
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+RELIEF: int = 3  # Worry is divided by this after each inspection, while the monkeys are still calm
+Operation = Callable[[int], int]  # Returns the new worry level from the old one
+
+OPERATORS: dict[str, Callable[[int, int], int]] = {
+    "*": operator.mul,
+    "/": operator.truediv,
+    "+": operator.add,
+    "-": operator.sub,
+}
 
 
 # Main
@@ -37,42 +50,29 @@ class Monkey:
         self.__class__.big_num *= test  # Store the big num for reducing worry
 
     @staticmethod
-    def parse_operation(operation: str, test: int) -> Callable:
-
-        """Returns a lambda that performs the operation."""
-
-        # Create operation
-        operation = operation.split(" ")
-
-        # Get operator
-        match operation[1]:
-            case "*":
-                op = operator.mul
-            case "/":
-                op = operator.truediv
-            case "+":
-                op = operator.add
-            case "-":
-                op = operator.sub
-            case _:
-                raise ValueError("Invalid operator.")
-
-        def operation_lambda(old: int, relief: bool) -> tuple[bool, int]:
-
-            # Get second value
-            second = None
-            if operation[2] != "old":
-                second = int(operation[2])
-
-            # Two old values
-            if not second:
-                second = old
-
-            new = op(old, second)
-            new = new // 3 if relief else new
-            return new % test == 0, new
-
-        return operation_lambda
+    def parse_operation(operation: str) -> Operation:
+
+        """
+        Returns the operation compiled into a callable specialised for its operator and operand, so that nothing about
+        the operation needs to be looked at again when an item is inspected.
+        """
+
+        _, symbol, operand = operation.split(" ")
+        if symbol not in OPERATORS:
+            raise ValueError("Invalid operator.")
+        op = OPERATORS[symbol]
+
+        # Two old values
+        if operand == "old":
+            if symbol == "*":
+                return lambda old: old * old
+            return lambda old: op(old, old)
+
+        # Constant operand, which only commutes for addition and multiplication
+        constant = int(operand)
+        if symbol in "*+":
+            return partial(op, constant)
+        return lambda old: op(old, constant)
 
     @classmethod
     def from_input(cls, input_str: str) -> Self:
@@ -82,7 +82,7 @@ class Monkey:
         information = input_str.split("\n")
 
         # Parse ID
-        id = int(information[0][7])
+        id = int(information[0].split()[1].rstrip(":"))
 
         # Parse items
         items = information[1].replace(",", " ").split()[2:]
@@ -95,7 +95,7 @@ class Monkey:
 
         # Parse operation
         operation = information[2].split("=")[-1].strip()
-        operation = cls.parse_operation(operation, test_num)
+        operation = cls.parse_operation(operation)
 
         return Monkey(
             _id=id,
@@ -110,43 +110,64 @@ class Monkey:
 
         """The monkey inspects and throws items to other monkeys."""
 
+        operation = self.operation
+        test = self.test
+        big_num = self.__class__.big_num
+        pass_items = self.__class__.jungle[self.pass_id].items
+        fail_items = self.__class__.jungle[self.fail_id].items
+
         for item in self.items:
 
             # Perform operation
-            test_passed, new_worry = self.operation(item, relief)
-            self.inspections += 1
-
-            # Reduce worry non-destructively
-            new_worry %= self.big_num
-
-            # Select monkey to throw to
-            if test_passed:
-                next_id = self.pass_id
-
+            new_worry = operation(item)
+            if relief:
+                new_worry //= RELIEF
+
+            # Reduce worry non-destructively, the test divides the big num so it can be done on the reduced worry
+            new_worry %= big_num
+            if new_worry % test == 0:
+                pass_items.append(new_worry)
             else:
-                next_id = self.fail_id
-
-            monkey = self.__class__.jungle[next_id]
-            monkey.items.append(new_worry)
+                fail_items.append(new_worry)
 
+        self.inspections += len(self.items)
         self.items = []  # Reset items as they have all been thrown
 
     def __repr__(self):
         return f"Monkey {self.id}: {self.items} {self.inspections}"
 
 
-def main():
+def parse(source: Source) -> list[str]:
+
+    """Returns the chunk of input text describing each monkey."""
+
+    with open_input(source) as buffer:
+        return [block.decode() for block in blocks(buffer)]
 
-    # Unload input
-    with open(INPUT_FILE, "r") as file:
-        raw_monkeys = file.read().split("\n\n")
 
-    # Create monkeys
+def create_jungle(raw_monkeys: list[str]) -> None:
+
+    """Resets the jungle and fills it with freshly created monkeys."""
+
+    Monkey.jungle = {}
+    Monkey.big_num = 1
     for monkey in raw_monkeys:
         Monkey.from_input(monkey)
 
-    # Part 1
-    # Which two monkeys inspected the most items
+
+def monkey_business() -> int:
+
+    """Returns the product of the inspection counts of the two most active monkeys."""
+
+    two_highest = sorted(Monkey.jungle.values(), key=lambda x: x.inspections, reverse=True)[:2]
+    return two_highest[0].inspections * two_highest[1].inspections
+
+
+def part_1(raw_monkeys: list[str]) -> int:
+
+    """Returns the level of monkey business after 20 rounds."""
+
+    create_jungle(raw_monkeys)
 
     # Perform rounds
     for _ in range(20):
@@ -155,21 +176,16 @@ def main():
         for monkey in Monkey.jungle.values():
             monkey.take_turn()
 
-    two_highest = sorted(Monkey.jungle.values(), key=lambda x: x.inspections, reverse=True)[:2]
-    monkey_business = two_highest[0].inspections * two_highest[1].inspections
-    print(f"The level of monkey business is: {monkey_business}.")
+    return monkey_business()
 
-    # Part 2
-    # What is the monkey business if worry levels are no longer divided by three after inspection
 
-    # Reset monkeys
-    Monkey.jungle = {}
-    Monkey.big_num = 1
-    for monkey in raw_monkeys:
-        Monkey.from_input(monkey)
+def part_2(raw_monkeys: list[str]) -> int:
+
+    """Returns the level of monkey business after 10,000 rounds without worry being divided by three."""
+
+    create_jungle(raw_monkeys)
 
     # 1000 Rounds
-    bar = Bar("Rounds", max=10_000)
     for _ in range(10_000):
 
         # Loop through monkeys
@@ -181,12 +197,28 @@ def main():
         #     print(print_monkey)
         # print()
 
-        bar.next()
-    bar.finish()
+    return monkey_business()
 
-    two_highest = sorted(Monkey.jungle.values(), key=lambda x: x.inspections, reverse=True)[:2]
-    monkey_business = two_highest[0].inspections * two_highest[1].inspections
-    print(f"The level of monkey business without reducing worry is: {monkey_business}.")
+
+def solve(raw_monkeys: list[str]) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(raw_monkeys), part_2(raw_monkeys))
+
+
+def main(input_file: str = INPUT_FILE):
+
+    # Unload input
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # Which two monkeys inspected the most items
+    print(f"The level of monkey business is: {answers.part_1}.")
+
+    # Part 2
+    # What is the monkey business if worry levels are no longer divided by three after inspection
+    print(f"The level of monkey business without reducing worry is: {answers.part_2}.")
 
 
 if __name__ == '__main__':
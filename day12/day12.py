@@ -2,9 +2,14 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
 import string
 
+from aoc.answers import Answers
+from aoc.inputs import Source, read_lines
+
 # Constants
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 Map = list[list[str]]
 Coordinates = tuple[int, int]
 GraphMap = dict[Coordinates, list[Coordinates]]
@@ -202,43 +207,36 @@ def display_path(path: Path, height_map: Map, start: Coordinates, end: Coordinat
         print()
 
 
-def main():
+def parse(source: Source) -> tuple[Map, GraphMap]:
+
+    """Returns the height map along with its traversable graph."""
 
     # Load input
     height_map: Map = []
-    move_matrix: Map = []
-    with open("input.txt", 'r') as file:
-        for line in file:
-            line = line[:-1]  # Remove newline character
-            height_map.append(list(line))
-            move_matrix.append(["." for _ in line])
+    for line in read_lines(source):
+        line = line[:-1]  # Remove newline character
+        height_map.append(list(line))
 
     # Turn the input into a graph
-    graph_map: GraphMap = graphify(height_map)
-    start: Coordinates = graph_map[START_MARKER][0]
-    end: Coordinates = graph_map[END_MARKER][0]
+    return height_map, graphify(height_map)
 
-    # Part 1
-    # What is the fewest steps required to move from your current position to the best signal location
 
-    # Navigate the map
-    path = traverse_map(graph_map, start)
+def shortest_path(terrain: tuple[Map, GraphMap]) -> Path:
 
-    # Display the path that was used
-    display_path(
-        path=path,
-        height_map=height_map,
-        start=start,
-        end=end
-    )
+    """Returns the shortest path from the start to the best signal location."""
 
-    print(f"The fewest number of steps required to traverse the map is {len(path)}.")
+    _, graph_map = terrain
+    return traverse_map(graph_map, graph_map[START_MARKER][0])
 
-    # Part two
-    # What is the fewest steps required to move starting from any square with elevation a to E
+
+def best_path_from_any_start(terrain: tuple[Map, GraphMap]) -> tuple[Coordinates, Path]:
+
+    """Returns the shortest path to the best signal location starting from any square with elevation a."""
+
+    height_map, graph_map = terrain
 
     # Find all starting positions with elevation a
-    possible_starts = [start]
+    possible_starts = [graph_map[START_MARKER][0]]
     for y in range(len(height_map)):
         for x in range(len(height_map[0])):
             if height_map[y][x] == "a":
@@ -255,20 +253,67 @@ def main():
             )
 
     # Determine the shortest path
-    shortest = min(paths, key=lambda p: len(p[1]))
-    shortest_path: Path = shortest[1]
-    shortest_start: Coordinates = shortest[0]
+    return min(paths, key=lambda p: len(p[1]))
+
+
+def part_1(terrain: tuple[Map, GraphMap]) -> int:
+
+    """Returns the fewest steps required to move from the start to the best signal location."""
+
+    return len(shortest_path(terrain))
+
+
+def part_2(terrain: tuple[Map, GraphMap]) -> int:
+
+    """Returns the fewest steps required to move from any square with elevation a to the best signal location."""
+
+    return len(best_path_from_any_start(terrain)[1])
+
+
+def solve(terrain: tuple[Map, GraphMap]) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(terrain), part_2(terrain))
+
+
+def main(input_file: str = INPUT_FILE):
+
+    terrain = parse(input_file)
+    height_map, graph_map = terrain
+    start: Coordinates = graph_map[START_MARKER][0]
+    end: Coordinates = graph_map[END_MARKER][0]
+
+    # Part 1
+    # What is the fewest steps required to move from your current position to the best signal location
+
+    # Navigate the map
+    path = shortest_path(terrain)
+
+    # Display the path that was used
+    display_path(
+        path=path,
+        height_map=height_map,
+        start=start,
+        end=end
+    )
+
+    print(f"The fewest number of steps required to traverse the map is {len(path)}.")
+
+    # Part two
+    # What is the fewest steps required to move starting from any square with elevation a to E
+    shortest_start, best_path = best_path_from_any_start(terrain)
 
     # Print shortest path
     display_path(
-        path=shortest_path,
+        path=best_path,
         start=shortest_start,
         end=end,
         height_map=height_map
     )
 
     print(f"The fewest steps required to reach endpoint {end} from the best starting point {shortest_start} is "
-          f"{len(shortest_path)}")
+          f"{len(best_path)}")
 
 
 if __name__ == '__main__':
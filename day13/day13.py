@@ -4,9 +4,15 @@ __author__ = "Matteo Golin"
 # Imports
 import json
 import functools
+import os
+from typing import Iterable
 from enum import Enum
 
+from aoc.answers import Answers
+from aoc.inputs import Source, blocks, open_input
+
 # Constants
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 PacketPair = tuple[list, list]
 PacketPairList = list[PacketPair]
 
@@ -20,7 +26,7 @@ class ComparisonState(Enum):
 
 
 # Helper functions
-def parse_pairs(raw_pairs: list[str]) -> PacketPairList:
+def parse_pairs(raw_pairs: Iterable[bytes]) -> PacketPairList:
 
     """Returns the raw input packets as a list of pairs, parsed into Python lists and ints."""
 
@@ -28,7 +34,7 @@ def parse_pairs(raw_pairs: list[str]) -> PacketPairList:
     for pair in raw_pairs:
 
         # Process into Python objects
-        first, second = pair.split("\n")
+        first, second = pair.split(b"\n")
         first = json.loads(first)
         second = json.loads(second)
 
@@ -106,16 +112,18 @@ def bubble_sort(packets: list) -> None:
                 packets[j], packets[j + 1] = packets[j + 1], packets[j]
 
 
-# Main
-def main():
+def parse(source: Source) -> PacketPairList:
 
-    # Load input
-    with open("input.txt", 'r') as file:
-        raw_pairs: list[str] = file.read().split("\n\n")
-    pairs: PacketPairList = parse_pairs(raw_pairs)
+    """Returns the packet pairs in the input file."""
+
+    with open_input(source) as buffer:
+        return parse_pairs(blocks(buffer))
+
+
+def part_1(pairs: PacketPairList) -> int:
+
+    """Returns the sum of the indices of the packet pairs that are in order, starting indexing at 1."""
 
-    # Part 1
-    # What is the sum of the indices of the packet pairs that are in order, starting indexing at 1
     ordered: list[int] = []
 
     for _ in range(len(pairs)):
@@ -126,10 +134,13 @@ def main():
         if result == ComparisonState.TRUE:
             ordered.append(_ + 1)
 
-    print(f"The sum of the indices in the correct order is {sum(ordered)}.")
+    return sum(ordered)
+
+
+def part_2(pairs: PacketPairList) -> int:
+
+    """Returns the product of the divider packet indices once all the packets are put in order."""
 
-    # Part 2
-    # Put all the packets in order including divider packets, then return the product of the divider packet indices
     DIVIDER1 = [[2]]
     DIVIDER2 = [[6]]
 
@@ -140,8 +151,29 @@ def main():
 
     bubble_sort(all_pairs)
 
-    decoder_key = (all_pairs.index(DIVIDER1) + 1) * (all_pairs.index(DIVIDER2) + 1)
-    print(f"The decoder key for the distress signal is {decoder_key}.")
+    return (all_pairs.index(DIVIDER1) + 1) * (all_pairs.index(DIVIDER2) + 1)
+
+
+def solve(pairs: PacketPairList) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(pairs), part_2(pairs))
+
+
+# Main
+def main(input_file: str = INPUT_FILE):
+
+    # Load input
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # What is the sum of the indices of the packet pairs that are in order, starting indexing at 1
+    print(f"The sum of the indices in the correct order is {answers.part_1}.")
+
+    # Part 2
+    # Put all the packets in order including divider packets, then return the product of the divider packet indices
+    print(f"The decoder key for the distress signal is {answers.part_2}.")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,13 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+
+from aoc.answers import Answers
+from aoc.inputs import Source, read_lines
 
 # Constants
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 ROCK: str = "#"
 AIR: str = "."
 FALLING_SAND: str = "+"
@@ -12,6 +17,7 @@ Coordinates = tuple[int, int]
 Path = list[Coordinates]
 Map = list[list[str]]
 SAND_SOURCE: Coordinates = (500, 0)
+Cave = tuple[list[Path], int, int, Coordinates]
 
 
 # Helper functions
@@ -146,8 +152,9 @@ def simulate(sand_source: Coordinates, map: Map) -> int:
         sand_grains += 1  # One more for every piece of sand that comes to rest
 
 
-# Main
-def main():
+def parse(source: Source) -> Cave:
+
+    """Returns the rock paths normalized to the map bounds, the map dimensions and the corrected sand source."""
 
     # Record the boundaries of the map
     bounding_coordinates: dict[str, int] = {
@@ -159,11 +166,8 @@ def main():
 
     # Load input
     paths: list[Path] = []
-    with open("input.txt", 'r') as file:
-        for line in file:
-            paths.append(path_from_line(line, bounding_coordinates))
-
-    # Part 1
+    for line in read_lines(source):
+        paths.append(path_from_line(line, bounding_coordinates))
 
     bounding_coordinates["max_y"] += 2  # Increase Y by two for the sake of part 2
     # Increase the max Y so that there is space for sand to build up
@@ -175,24 +179,63 @@ def main():
     y_dimension = bounding_coordinates["max_y"] - bounding_coordinates["min_y"]
     corrected_sand = SAND_SOURCE[0] - bounding_coordinates["min_x"], SAND_SOURCE[1] - bounding_coordinates["min_y"]
 
-    # Create map
-    map = create_map(paths, x_dimension, y_dimension, corrected_sand)
-    print_map(map)
+    return paths, x_dimension, y_dimension, corrected_sand
 
-    # Simulate
-    grains = simulate(corrected_sand, map)
-    print_map(map)
-    print(f"There are {grains} grains of sand that come to rest before flowing into the abyss.")
 
-    # Part 2
+def fill_with_sand(cave: Cave, floor: bool) -> tuple[int, Map]:
+
+    """Returns the number of grains of sand that come to rest, and the map they came to rest on."""
+
+    paths, x_dimension, y_dimension, corrected_sand = cave
 
     # Include infinite line
-    paths.append([(0, y_dimension), (x_dimension, y_dimension)])
+    if floor:
+        paths = paths + [[(0, y_dimension), (x_dimension, y_dimension)]]
 
-    # Reset the map
     map = create_map(paths, x_dimension, y_dimension, corrected_sand)
     grains = simulate(corrected_sand, map)
-    print(f"There are {grains} grains of sand before the source is blocked.")
+    return grains, map
+
+
+def part_1(cave: Cave) -> int:
+
+    """Returns the number of grains of sand that come to rest before sand flows into the abyss."""
+
+    return fill_with_sand(cave, floor=False)[0]
+
+
+def part_2(cave: Cave) -> int:
+
+    """Returns the number of grains of sand that come to rest before the source is blocked."""
+
+    return fill_with_sand(cave, floor=True)[0]
+
+
+def solve(cave: Cave) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(cave), part_2(cave))
+
+
+# Main
+def main(input_file: str = INPUT_FILE):
+
+    cave = parse(input_file)
+    paths, x_dimension, y_dimension, corrected_sand = cave
+
+    # Part 1
+
+    # Create map
+    print_map(create_map(paths, x_dimension, y_dimension, corrected_sand))
+
+    # Simulate
+    grains, map = fill_with_sand(cave, floor=False)
+    print_map(map)
+    print(f"There are {grains} grains of sand that come to rest before flowing into the abyss.")
+
+    # Part 2
+    print(f"There are {part_2(cave)} grains of sand before the source is blocked.")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,14 @@ __author__ = "Matteo Golin"
 # Imports
 from typing import TypeAlias
 from dataclasses import dataclass
+import os
 import re
 
+from aoc.answers import Answers
+from aoc.inputs import Source, read_lines
+
 # Constants
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 Coordinates: TypeAlias = tuple[int, int]
 Y: int = 2_000_000
 LIMIT: int = 4_000_000
@@ -35,9 +40,9 @@ def parse_sensor_and_beacon_coordinates(file_line: str) -> tuple[Sensor, Coordin
     return Sensor(sx, sy, manhattan_distance((sx, sy), beacon)), beacon
 
 
-def row_coverage(y: int, sensors: list[Sensor], minx: int) -> list[bool]:
+def row_coverage(y: int, sensors: list[Sensor], minx: int, maxx: int) -> list[bool]:
     """Returns a list which describes which cells in the provided row are within a sensor's coverage zone."""
-    row = [False for _ in range(minx, maxx)]
+    row = [False for _ in range(minx, maxx + 1)]
     for sensor in sensors:
         # Skip sensor if radius does not reach row
         higher = sensor.y > y
@@ -81,21 +86,24 @@ def collapse_ranges(ranges: list[tuple[int, int]]) -> tuple[int, int] | int:
     return ranges[0][0], maxx
 
 
-if __name__ == "__main__":
-    # Parse input
+def parse(source: Source) -> tuple[list[Sensor], set[Coordinates]]:
+    """Returns the sensors and the beacons they detected."""
     sensors: list[Sensor] = []
     beacons: set[Coordinates] = set()
-    with open("./input.txt", "r") as file:
-        for line in file:
-            sensor, beacon = parse_sensor_and_beacon_coordinates(line)
-            sensors.append(sensor)
-            beacons.add(beacon)
+    for line in read_lines(source):
+        sensor, beacon = parse_sensor_and_beacon_coordinates(line)
+        sensors.append(sensor)
+        beacons.add(beacon)
+    return sensors, beacons
 
-    # Part 1: How many positions cannot contain a beacon in row y=2_000_000
+
+def part_1(readings: tuple[list[Sensor], set[Coordinates]]) -> int:
+    """Returns how many positions cannot contain a beacon in row Y."""
+    sensors, beacons = readings
 
     # Define x limits
     minx, maxx = sensors[0].x, sensors[0].x
-    for sensor in sensors[1:]:
+    for sensor in sensors:
         left = sensor.x - sensor.radius
         right = sensor.x + sensor.radius
         if left < minx:
@@ -104,16 +112,19 @@ if __name__ == "__main__":
             maxx = right
 
     # Count coverage in specific row
-    row = row_coverage(Y, sensors, minx)
+    row = row_coverage(Y, sensors, minx, maxx)
 
     # Remove beacons
     for beacon in beacons:
         if beacon[1] == Y:
             row[beacon[0] - minx] = False
 
-    print(f"There are {sum(row)} spaces which cannot contain a beacon in row y={Y}.")
+    return sum(row)
 
-    # Part 2: Tuning frequency of distress beacon
+
+def part_2(readings: tuple[list[Sensor], set[Coordinates]]) -> int:
+    """Returns the tuning frequency of the distress beacon."""
+    sensors, _ = readings
     tuning_freq = 0
     ranges = coverage_ranges(sensors, LIMIT)
     for y, range_collection in enumerate(ranges):
@@ -121,5 +132,24 @@ if __name__ == "__main__":
         if type(result) is int:
             tuning_freq = result * 4_000_000 + y
             break
+    return tuning_freq
+
+
+def solve(readings: tuple[list[Sensor], set[Coordinates]]) -> Answers[int, int]:
+    """Returns the answers to both parts of the puzzle."""
+    return Answers(part_1(readings), part_2(readings))
 
-    print(f"The tuning frequency of the distress beacon is {tuning_freq}")
+
+def main(input_file: str = INPUT_FILE):
+    # Parse input and solve
+    answers = solve(parse(input_file))
+
+    # Part 1: How many positions cannot contain a beacon in row y=2_000_000
+    print(f"There are {answers.part_1} spaces which cannot contain a beacon in row y={Y}.")
+
+    # Part 2: Tuning frequency of distress beacon
+    print(f"The tuning frequency of the distress beacon is {answers.part_2}")
+
+
+if __name__ == "__main__":
+    main()
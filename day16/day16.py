@@ -2,11 +2,16 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
 import re
 from typing import Self, TypeAlias
 from dataclasses import dataclass
 
+from aoc.answers import Answers
+from aoc.inputs import Source, read_lines
+
 # Constants
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 TIME_LIMIT: int = 30
 START_VALVE: str = "AA"
 ELEPHANT_TIME: int = 4
@@ -82,36 +87,58 @@ def most_pressure(time: int, pos: str, graph: ValveSystem, opened: tuple, cache:
     return pressure
 
 
-# Main
-if __name__ == "__main__":
-    # Parse input
+def parse(source: Source) -> ValveSystem:
+    """Returns the collapsed graph of valves and the tunnels between them."""
     valves: dict[str, Valve] = {}
     graph: ValveSystem = {}
-    with open("./input.txt", "r") as file:
-        for line in file:
-            valve = Valve.from_line(line)
-            valves[valve.name] = valve
+    lines = list(read_lines(source))
+    for line in lines:
+        valve = Valve.from_line(line)
+        valves[valve.name] = valve
 
-        # Create graph
-        file.seek(0)
-        for line in file:
-            connections = re.findall(r"[A-Z]{2}", line)
-            graph[connections[0]] = [(valves[con], 1) for con in connections[1:]]  # All tunnels have a cost of 1
+    # Create graph
+    for line in lines:
+        connections = re.findall(r"[A-Z]{2}", line)
+        graph[connections[0]] = [(valves[con], 1) for con in connections[1:]]  # All tunnels have a cost of 1
 
     # Collapse graph
     # Valves with flow rate of 0 are useless to open, so they should be condensed into one path leading to a valve with
     # a flow rate > 0.
     collapse(graph, valves, START_VALVE)
+    return graph
 
-    # Part 1: Most pressure released
+
+def part_1(graph: ValveSystem) -> int:
+    """Returns the most pressure that can be released in TIME_LIMIT minutes."""
     # All valves are equidistant and require 1 minute to travel between
     # All valves take one minute to open
     # Pressure is calculated by multiplying flow rate by time open
-    total_pressure = most_pressure(TIME_LIMIT, START_VALVE, graph, tuple(), dict(), 0)
-    print(f"The most pressure that can be released in {TIME_LIMIT} minutes is {total_pressure}")
+    return most_pressure(TIME_LIMIT, START_VALVE, graph, tuple(), dict(), 0)
 
-    # Part 2: Request help from the elephant
+
+def part_2(graph: ValveSystem) -> int:
+    """Returns the most pressure that can be released in TIME_LIMIT minutes with the elephant's help."""
     # Takes 4 minutes to teach the elephant how to help
     # After 4 minutes, you and the elephant work simultaneously
-    total_help_pressure = most_pressure(TIME_LIMIT - ELEPHANT_TIME, START_VALVE, graph, tuple(), dict(), 1)
-    print(f"The most pressure that can be released in {TIME_LIMIT} minutes with the elephant is {total_help_pressure}")
+    return most_pressure(TIME_LIMIT - ELEPHANT_TIME, START_VALVE, graph, tuple(), dict(), 1)
+
+
+def solve(graph: ValveSystem) -> Answers[int, int]:
+    """Returns the answers to both parts of the puzzle."""
+    return Answers(part_1(graph), part_2(graph))
+
+
+# Main
+def main(input_file: str = INPUT_FILE):
+    # Parse input and solve
+    answers = solve(parse(input_file))
+
+    # Part 1: Most pressure released
+    print(f"The most pressure that can be released in {TIME_LIMIT} minutes is {answers.part_1}")
+
+    # Part 2: Request help from the elephant
+    print(f"The most pressure that can be released in {TIME_LIMIT} minutes with the elephant is {answers.part_2}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 # Advent of Code: Day 17
 __author__ = "Matteo Golin"
 
+import os
 from typing import Literal, TypeAlias, Iterable
 
+from aoc.answers import Answers
+from aoc.inputs import Source, read_text
+
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+
 # All rocks relative to bottom leftmost edge
 Coordinate: TypeAlias = tuple[int, int]
 Rock: TypeAlias = set[Coordinate]
@@ -64,7 +70,6 @@ def drop_rock(
         if occupied & translated_rock:  # If the rock will intersect with another...
             occupied.update(rock)  # Record rock spaces as occupied
             if fall_pattern in fallen:
-                print(fall_pattern)
                 fallen["cycle start"] = fallen[fall_pattern]
                 return -1
 
@@ -95,7 +100,7 @@ def draw_image(occupied: set[Coordinate]) -> None:
     print("-" * (CHAMBER_WIDTH + 2))
 
 
-def height_after(rocks: int) -> int:
+def height_after(rocks: int, jet_stream: JetStream) -> int:
     """Returns the height of the rock tower after the passed number of rocks have fallen."""
     cur_jet = 0
     total_rocks = 0
@@ -108,37 +113,47 @@ def height_after(rocks: int) -> int:
             break
         total_rocks += 1
 
-    if rocks == 5 or rocks == 20:
-        draw_image(occupied)
-
     if cur_jet == -1:
         period_len = total_rocks - fall_patterns["cycle start"]
-        print(f"Cycle detected from rock {fall_patterns['cycle start']} to rock {total_rocks}.")
-        height_after(fall_patterns["cycle start"])
-        height_after(total_rocks)
-        print(f"Cycle has period of {period_len}")
         current_height = height(occupied)
-        print(f"The current height is {current_height}")
-        period_height = current_height - height_after(fall_patterns["cycle start"])
-        print(f"The height of each period is {period_height}")
+        period_height = current_height - height_after(fall_patterns["cycle start"], jet_stream)
         periods, remainder = divmod(rocks - total_rocks, period_len)
-
-        print(periods, remainder)
-        return current_height + (periods * period_height) + height_after(remainder)
+        return current_height + (periods * period_height) + height_after(remainder, jet_stream)
 
     return height(occupied)
 
 
+def parse(source: Source) -> JetStream:
+    """Returns the jet pattern as a list of horizontal pushes."""
+    return list(map(lambda x: 1 if x == ">" else -1, read_text(source).strip()))
+
+
+def part_1(jet_stream: JetStream) -> int:
+    """Returns the height of the tower after ROCKS_TO_FALL_1 rocks have fallen."""
+    return height_after(ROCKS_TO_FALL_1, jet_stream)
+
+
+def part_2(jet_stream: JetStream) -> int:
+    """Returns the height of the tower after ROCKS_TO_FALL_2 rocks have fallen."""
+    return height_after(ROCKS_TO_FALL_2, jet_stream)
+
+
+def solve(jet_stream: JetStream) -> Answers[int, int]:
+    """Returns the answers to both parts of the puzzle."""
+    return Answers(part_1(jet_stream), part_2(jet_stream))
+
+
 # Main
-if __name__ == "__main__":
-    # Parse input
-    jet_stream: JetStream = []
-    with open("./example.txt") as file:
-        jet_stream = list(map(lambda x: 1 if x == ">" else -1, file.read().strip()))
+def main(input_file: str = INPUT_FILE):
+    # Parse input and solve
+    answers = solve(parse(input_file))
 
     # Part 1: How tall is the tower after 2022 rocks have fallen?
-    h = height_after(ROCKS_TO_FALL_1)
-    print(f"The tower of rocks will be {h} units tall after {ROCKS_TO_FALL_1} rocks have stopped falling.")
+    print(f"The tower of rocks will be {answers.part_1} units tall after {ROCKS_TO_FALL_1} rocks have stopped falling.")
 
     # Part 2: How tall is the tower after 1000000000000 rocks have fallen.
-    print(f"The tower of rocks will be {h} units tall after {ROCKS_TO_FALL_2} rocks have stopped falling.")
+    print(f"The tower of rocks will be {answers.part_2} units tall after {ROCKS_TO_FALL_2} rocks have stopped falling.")
+
+
+if __name__ == "__main__":
+    main()
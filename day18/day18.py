@@ -1,9 +1,16 @@
 # Advent of Code: Day 18
 __author__ = "Matteo Golin"
 
+import os
 from typing import Self
 from dataclasses import dataclass
 
+from aoc.answers import Answers
+from aoc.inputs import Source, read_lines
+
+
+INPUT_FILE: str = os.path.join(os.path.dirname(__file__), "input.txt")
+TEST_FILE: str = os.path.join(os.path.dirname(__file__), "test.txt")
 NEIGHBOURS: list[tuple[int, int, int]] = [
     (1, 0, 0),
     (0, 1, 0),
@@ -51,12 +58,11 @@ class Coordinate:
     __repr__ = __str__
 
 
-def parse_input(file_path: str) -> set[Coordinate]:
+def parse(source: Source) -> set[Coordinate]:
     """Parses the puzzle input into 3D coordinates."""
     coordinates = set()
-    with open(file_path, "r") as file:
-        for line in file:
-            coordinates.add(Coordinate(*list(map(int, line.split(",")))))
+    for line in read_lines(source):
+        coordinates.add(Coordinate(*list(map(int, line.split(",")))))
     return coordinates
 
 
@@ -107,17 +113,35 @@ def sa_minus_pockets(coords: set[Coordinate]) -> int:
     return sa
 
 
+def part_1(coords: set[Coordinate]) -> int:
+    """Returns the surface area of the lava droplet."""
+    return surface_area(coords)
+
+
+def part_2(coords: set[Coordinate]) -> int:
+    """Returns the external surface area of the lava droplet."""
+    return sa_minus_pockets(coords)
+
+
+def solve(coords: set[Coordinate]) -> Answers[int, int]:
+    """Returns the answers to both parts of the puzzle."""
+    return Answers(part_1(coords), part_2(coords))
+
+
 # Main
-def main():
+def main(input_file: str = INPUT_FILE):
+    test_coords = parse(TEST_FILE)
+    coords = parse(input_file)
+
     print("Part 1: What is the surface area of the lava droplet.")
-    print(f"TEST: {surface_area(parse_input('test.txt'))}")
-    print(surface_area(parse_input("input.txt")))
+    print(f"TEST: {part_1(test_coords)}")
+    print(part_1(coords))
     print()
 
     # Approach: Look for all outer surfaces instead of looking for inner pockets
     print("Part 2: What is the external surface area of the lava droplet (excluding pockets).")
-    print(f"TEST: {sa_minus_pockets(parse_input('test.txt'))}")
-    print(sa_minus_pockets(parse_input("input.txt")))
+    print(f"TEST: {part_2(test_coords)}")
+    print(part_2(coords))
 
 
 if __name__ == "__main__":
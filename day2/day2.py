@@ -2,9 +2,18 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+
+from aoc.answers import Answers
+from aoc.inputs import LINE, Source, open_input, spans
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 SYMBOL_MAP = {
     "A": "rock",
     "B": "paper",
@@ -31,6 +40,12 @@ WIN_MAP = {
     "paper": "scissors",
     "scissors": "rock"
 }
+OPPONENT_SYMBOLS = "ABC"
+SECOND_SYMBOLS = "XYZ"
+ROUND_WIDTH: int = 4  # Two symbols, a space and a new line
+
+# Types
+Table = list[list[int]]  # Indexed by the opponent's symbol, then the second column's symbol
 
 
 # Main
@@ -66,42 +81,96 @@ def score_from_outcome(opponent_move: str, outcome: str) -> int:
     return SCORE_MAP[player_move] + SCORE_MAP[outcome]
 
 
-def main():
+# Every possible round, scored once for each strategy
+SCORE_TABLE_1: Table = [
+    [game_score(SYMBOL_MAP[opponent], SYMBOL_MAP[player]) for player in SECOND_SYMBOLS]
+    for opponent in OPPONENT_SYMBOLS
+]
+SCORE_TABLE_2: Table = [
+    [score_from_outcome(SYMBOL_MAP[opponent], OUTCOME_MAP[outcome]) for outcome in SECOND_SYMBOLS]
+    for opponent in OPPONENT_SYMBOLS
+]
+ROUNDS: list[bytes] = [f"{opponent} {second}".encode() for opponent in OPPONENT_SYMBOLS for second in SECOND_SYMBOLS]
 
-    # Part 1
-    # Calculate player score assuming second column indicates which move should be played
-    player_score: int = 0
-    with open(INPUT_FILE, 'r') as file:
 
-        # Each line represents a round
-        for line in file:
-            opponent, player = line.strip().split(" ")  # Unpack moves
+def count_rounds(chunk: bytes) -> list[int]:
 
-            # Map moves
-            opponent: str = SYMBOL_MAP[opponent]
-            player: str = SYMBOL_MAP[player]
+    """Returns how many times each possible round is played in the chunk of whole lines, in the order of ROUNDS."""
 
-            player_score += game_score(opponent, player)
+    # Every line has the same width, so the symbols can be picked out of the raw bytes as columns
+    if np is not None and len(chunk) % ROUND_WIDTH == 0:
+        columns = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, ROUND_WIDTH)
+        opponent = columns[:, 0] - ord(OPPONENT_SYMBOLS[0])
+        second = columns[:, 2] - ord(SECOND_SYMBOLS[0])
 
-    print(f"The player's final score using the assumed strategy is {player_score} points.")
+        # Symbols below the first one wrap around to large values
+        if opponent.max() < 3 and second.max() < 3 and (columns[:, 3] == ord(LINE)).all():
+            return np.bincount(opponent * 3 + second, minlength=len(ROUNDS)).tolist()
 
-    # Part 2
-    # Calculate the player score if the strategy is implemented where the second column indicates the
-    # game outcome
-    player_strategy_score: int = 0
-    with open(INPUT_FILE, 'r') as file:
+    # Symbols from the first column are never next to a space followed by symbols from the second column except within
+    # a round, so each round can be counted with a substring search
+    return [chunk.count(played) for played in ROUNDS]
+
+
+def parse(source: Source) -> Table:
+
+    """Returns how many times each combination of symbols is played in the strategy guide."""
+
+    counts = [0] * len(ROUNDS)
+
+    # Each line represents a round, count them a chunk of lines at a time
+    with open_input(source) as buffer:
+        for start, end in spans(buffer, LINE):
+            for index, count in enumerate(count_rounds(buffer[start:end])):
+                counts[index] += count
+
+    return [counts[row:row + len(SECOND_SYMBOLS)] for row in range(0, len(counts), len(SECOND_SYMBOLS))]
+
+
+def total_score(rounds: Table, scores: Table) -> int:
+
+    """Returns the total score of the rounds played, with each round scored by the table."""
+
+    return sum(
+        count * score
+        for round_counts, round_scores in zip(rounds, scores)
+        for count, score in zip(round_counts, round_scores)
+    )
 
-        # Each line represents a round
-        for line in file:
-            opponent, outcome = line.strip().split(" ")  # Unpack moves
 
-            # Map moves
-            opponent: str = SYMBOL_MAP[opponent]
-            outcome: str = OUTCOME_MAP[outcome]
+def part_1(rounds: Table) -> int:
 
-            player_strategy_score += score_from_outcome(opponent, outcome)
+    """Returns the player score assuming the second column indicates which move should be played."""
 
-    print(f"The player's final score using the elf strategy is {player_strategy_score} points.")
+    return total_score(rounds, SCORE_TABLE_1)
+
+
+def part_2(rounds: Table) -> int:
+
+    """Returns the player score assuming the second column indicates the game outcome."""
+
+    return total_score(rounds, SCORE_TABLE_2)
+
+
+def solve(rounds: Table) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(rounds), part_2(rounds))
+
+
+def main(input_file: str = INPUT_FILE):
+
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # Calculate player score assuming second column indicates which move should be played
+    print(f"The player's final score using the assumed strategy is {answers.part_1} points.")
+
+    # Part 2
+    # Calculate the player score if the strategy is implemented where the second column indicates the
+    # game outcome
+    print(f"The player's final score using the elf strategy is {answers.part_2} points.")
 
 
 if __name__ == '__main__':
@@ -2,75 +2,107 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from functools import reduce
+from operator import or_
 from string import ascii_lowercase, ascii_uppercase
 
+from aoc.answers import Answers
+from aoc.inputs import LINE, Buffer, Source, open_input, spans
+
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 PRIORITIES = list(ascii_lowercase + ascii_uppercase)
+GROUP_SIZE: int = 3
+
+# Each item type is a bit in a mask, placed so that the bit length of the mask is the priority of its highest item type
+ITEM_BITS: list[int] = [
+    1 << PRIORITIES.index(chr(byte)) if chr(byte) in PRIORITIES else 0 for byte in range(256)
+]
+ALL_ITEMS: int = (1 << len(PRIORITIES)) - 1
+
+# Types
+PrioritySums = tuple[int, int]  # Compartment priorities and badge priorities
 
 
 # Main
-def common_item_type(items: str) -> str:
+def item_mask(items: bytes) -> int:
 
-    """Returns the common item type within the two compartments of the rucksack."""
+    """Returns the mask of the item types in the items."""
 
-    # Split items into two compartments
-    first_comp = items[:len(items) // 2]
-    second_comp = items[len(items) // 2:]
+    return reduce(or_, map(ITEM_BITS.__getitem__, items), 0)
 
-    # Find common item type
-    first_comp = set(first_comp)
-    second_comp = set(second_comp)
 
-    return list(first_comp.intersection(second_comp))[0]
+def priority_sums(buffer: Buffer) -> PrioritySums:
 
+    """
+    Returns the sum of the priorities of the item types in common between the compartments of each rucksack, and the
+    sum of the priorities of the badges of each group.
+    """
 
-def group_intersection(group: list[str]) -> str:
+    compartments = 0
+    badges = 0
+    group = ALL_ITEMS
+    members = 0
+    for start, end in spans(buffer, LINE):
+        for rucksack in buffer[start:end].split():
 
-    """Returns the common item type between three rucksacks in a group."""
+            # The item type in both compartments
+            half = len(rucksack) // 2
+            first, second = item_mask(rucksack[:half]), item_mask(rucksack[half:])
+            compartments += (first & second).bit_length()
 
-    group = [set(rucksack) for rucksack in group]
-    common = group[0]
+            # The item type every elf in the group carries, groups can continue into the next span
+            group &= first | second
+            members += 1
+            if members == GROUP_SIZE:
+                badges += group.bit_length()
+                group = ALL_ITEMS
+                members = 0
 
-    for rucksack in group[1:]:
-        common = common.intersection(rucksack)
+    return compartments, badges
 
-    return list(common)[0]
 
+def parse(source: Source) -> PrioritySums:
 
-def main():
+    """Returns the priority sums of both parts, computed in one pass over the rucksacks."""
 
-    # Part 1
-    # What is the sum of the priorities of the item types in common between compartments in the rucksack
-    priorities = []
-    with open(INPUT_FILE, 'r') as file:
+    with open_input(source) as buffer:
+        return priority_sums(buffer)
 
-        for line in file:
-            line = line.strip()
-            common = common_item_type(line)
-            priorities.append(PRIORITIES.index(common) + 1)
 
-    print(f"The sum of the priorities is {sum(priorities)}")
+def part_1(sums: PrioritySums) -> int:
 
-    # Part 2
-    # What is the sum of the priorities of the item types that each elf of three in a group have in common
-    counter: int = 0
-    priorities = []
-    current_group: list[str] = []
-    with open(INPUT_FILE, 'r') as file:
+    """Returns the sum of the priorities of the item types in common between the compartments of each rucksack."""
+
+    return sums[0]
+
+
+def part_2(sums: PrioritySums) -> int:
+
+    """Returns the sum of the priorities of the item types that each elf in a group of three has in common."""
 
-        for line in file:
-            counter += 1  # Increment counter
-            current_group.append(line.strip())
+    return sums[1]
 
-            # Beginning of new group
-            if counter % 3 == 0:
-                common = group_intersection(current_group)
-                priorities.append(PRIORITIES.index(common) + 1)
 
-                current_group = []
+def solve(sums: PrioritySums) -> Answers[int, int]:
 
-    print(f"The sum of the badge priorities is {sum(priorities)}")
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(sums), part_2(sums))
+
+
+def main(input_file: str = INPUT_FILE):
+
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # What is the sum of the priorities of the item types in common between compartments in the rucksack
+    print(f"The sum of the priorities is {answers.part_1}")
+
+    # Part 2
+    # What is the sum of the priorities of the item types that each elf of three in a group have in common
+    print(f"The sum of the badge priorities is {answers.part_2}")
 
 
 if __name__ == '__main__':
@@ -2,70 +2,212 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import array
+import os
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Sequence
+
+from aoc.answers import Answers
+from aoc.inputs import LINE, Source, open_input, spans
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 Range = tuple[int, int]
 Pair = tuple[Range, Range]
+Assignment = tuple[int, Range]  # The index of the pair the range was assigned in, and the range
+Column = Sequence[int]  # A NumPy array when NumPy is available, otherwise an array of signed 64-bit integers
+SEPARATORS: bytes = bytes.maketrans(b",-", b"  ")  # Turns a line into its four endpoints separated by spaces
+ENDPOINTS: int = 4
 
 
-def create_pair(line: str) -> Pair:
+@dataclass
+class Assignments:
+    """The section ranges of every assignment pair, stored as one column per endpoint."""
 
-    """Returns a pair of ranges from the file line."""
+    first_start: Column
+    first_end: Column
+    second_start: Column
+    second_end: Column
 
-    pair = line.split(",")
-    r1, r2 = pair[0].split("-")
-    r3, r4 = pair[1].split("-")
+    def pairs(self) -> Iterator[Pair]:
+        """Yields each assignment pair as a pair of ranges."""
+        # Both kinds of column convert to lists of Python integers in bulk
+        columns = (self.first_start, self.first_end, self.second_start, self.second_end)
+        for first_start, first_end, second_start, second_end in zip(*(column.tolist() for column in columns)):
+            yield (first_start, first_end), (second_start, second_end)
 
-    return (int(r1), int(r2)), (int(r3), int(r4))
 
+class IntervalIndex:
+    """
+    An index over the ranges of every assignment pair, answering which assignments overlap a range of sections and how
+    many assignments contain a section without rescanning every pair.
+    """
 
-def fully_overlapping(range1: Range, range2: Range) -> bool:
+    def __init__(self, pairs: Iterable[Pair]) -> None:
 
-    """Returns True if one of the ranges fully contains the other."""
+        # Assignments ordered by their start section, the ones starting after a query range can be ignored
+        self.assignments: list[Assignment] = [
+            (index, section_range) for index, pair in enumerate(pairs) for section_range in pair
+        ]
+        self.assignments.sort(key=lambda assignment: assignment[1][0])
+        self.starts: list[int] = [section_range[0] for _, section_range in self.assignments]
+        ends: list[int] = [section_range[1] for _, section_range in self.assignments]
+        self.ends: list[int] = sorted(ends)
+
+        # Binary tree of the latest end section under each node, leaves in the same order as the assignments
+        self.leaves = 1
+        while self.leaves < len(ends):
+            self.leaves *= 2
+
+        self.latest_end: list[float] = [float("-inf")] * (2 * self.leaves)
+        self.latest_end[self.leaves:self.leaves + len(ends)] = ends
+        level = self.leaves // 2
+        while level:
+            children = self.latest_end[2 * level:4 * level]
+            self.latest_end[level:2 * level] = map(max, children[0::2], children[1::2])
+            level //= 2
+
+    def __len__(self) -> int:
+        return len(self.assignments)
+
+    def containing(self, section: int) -> int:
+        """Returns how many assignments contain the section."""
+        return bisect_right(self.starts, section) - bisect_left(self.ends, section)
+
+    def count_overlapping(self, start: int, end: int) -> int:
+        """Returns how many assignments overlap the range of sections from start to end."""
+
+        # Assignments that don't overlap either start after the range or end before it, never both
+        return bisect_right(self.starts, end) - bisect_left(self.ends, start)
+
+    def overlapping(self, start: int, end: int) -> list[Assignment]:
+        """Returns the assignments that overlap the range of sections from start to end, ordered by their start."""
+
+        # Only the assignments starting before the range ends are candidates
+        candidates = bisect_right(self.starts, end)
+
+        # Descend into the subtrees of candidates which contain an assignment that ends after the range starts
+        found: list[Assignment] = []
+        stack: list[tuple[int, int, int]] = [(1, 0, self.leaves)]  # Node and the positions of the leaves under it
+        while stack:
+            node, first, last = stack.pop()
+            if first >= candidates or self.latest_end[node] < start:
+                continue
 
-    minimum = min(range1[0], range2[0])
-    maximum = max(range1[1], range2[1])
+            if node >= self.leaves:
+                found.append(self.assignments[first])
+                continue
 
-    return (minimum, maximum) in [range1, range2]
+            middle = (first + last) // 2
+            stack.append((2 * node + 1, middle, last))  # Right child is popped last to keep the order
+            stack.append((2 * node, first, middle))
 
+        return found
 
-def overlapping(range1: Range, range2: Range) -> bool:
+
+def fully_overlapping(first_start: int, first_end: int, second_start: int, second_end: int) -> bool:
+
+    """Returns True if one of the ranges fully contains the other."""
+
+    return (first_start <= second_start and second_end <= first_end) or (
+        second_start <= first_start and first_end <= second_end
+    )
+
+
+def overlapping(first_start: int, first_end: int, second_start: int, second_end: int) -> bool:
 
     """Returns True if the ranges are overlapping in any capacity."""
 
-    if range1[1] < range2[0] or range2[1] < range1[0]:
-        return False
+    return not (first_end < second_start or second_end < first_start)
+
+
+def parse_endpoints(chunk: bytes) -> Column:
+
+    """Returns every endpoint in the chunk of whole lines, in the order they appear."""
+
+    text = chunk.translate(SEPARATORS)
+    if np is not None:
+        endpoints = np.fromstring(text, dtype=np.int64, sep=" ")
+    else:
+        endpoints = array.array("q", map(int, text.split()))
+
+    if len(endpoints) % ENDPOINTS:
+        raise ValueError("Every assignment pair must be two ranges of the form start-end,start-end.")
 
-    return True
+    return endpoints
+
+
+def parse(source: Source) -> Assignments:
+
+    """Returns the endpoints of the assignment pairs in the input file, parsed in one pass."""
+
+    with open_input(source) as buffer:
+        chunks = [parse_endpoints(buffer[start:end]) for start, end in spans(buffer, LINE)]
+
+    if np is not None:
+        endpoints = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    else:
+        endpoints = array.array("q")
+        for chunk in chunks:
+            endpoints.extend(chunk)
+
+    # Every fourth endpoint belongs to the same column
+    return Assignments(*(endpoints[column::ENDPOINTS] for column in range(ENDPOINTS)))
+
+
+def part_1(assignments: Assignments) -> int:
+
+    """Returns the number of assignment pairs where one range fully contains the other."""
+
+    first_start, first_end = assignments.first_start, assignments.first_end
+    second_start, second_end = assignments.second_start, assignments.second_end
+    if np is not None and isinstance(first_start, np.ndarray):
+        contained = ((first_start <= second_start) & (second_end <= first_end)) | (
+            (second_start <= first_start) & (first_end <= second_end)
+        )
+        return int(np.count_nonzero(contained))
+
+    return sum(map(fully_overlapping, first_start, first_end, second_start, second_end))
+
+
+def part_2(assignments: Assignments) -> int:
+
+    """Returns the number of assignment pairs with ranges that overlap at all."""
+
+    first_start, first_end = assignments.first_start, assignments.first_end
+    second_start, second_end = assignments.second_start, assignments.second_end
+    if np is not None and isinstance(first_start, np.ndarray):
+        return int(np.count_nonzero((second_start <= first_end) & (first_start <= second_end)))
+
+    return sum(map(overlapping, first_start, first_end, second_start, second_end))
+
+
+def solve(assignments: Assignments) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    return Answers(part_1(assignments), part_2(assignments))
 
 
 # Main
-def main():
+def main(input_file: str = INPUT_FILE):
 
     # Unpack input
-    pairs = []
-    with open(INPUT_FILE, 'r') as file:
-        for line in file:
-            pairs.append(create_pair(line))
+    answers = solve(parse(input_file))
 
     # Part 1
     # In how many assignment pairs does one range fully contain the other
-    overlap_count = 0
-    for pair in pairs:
-        if fully_overlapping(*pair):
-            overlap_count += 1
-
-    print(f"The number of fully overlapping pairs is {overlap_count}.")
+    print(f"The number of fully overlapping pairs is {answers.part_1}.")
 
     # Part 2
     # How many assignment pairs have ranges that overlap at all
-    overlap_count = 0
-    for pair in pairs:
-        if overlapping(*pair):
-            overlap_count += 1
-
-    print(f"The number of overlapping pairs is {overlap_count}.")
+    print(f"The number of overlapping pairs is {answers.part_2}.")
 
 
 if __name__ == '__main__':
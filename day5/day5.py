@@ -2,122 +2,294 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from typing import Callable, Iterable, NamedTuple
+
+from aoc.answers import Answers
+from aoc.inputs import BLANK_LINE, LINE, Source, lines, native_separator, open_input, read_span
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 Movement = tuple[int, int, int]
+CHUNK_SIZE: int = 1024  # Crates in a chunk before it is no longer merged with its neighbours
+CHECKPOINT_INTERVAL: int = 1024  # Moves between the snapshots kept by a replay
+
+
+class Chunk(NamedTuple):
+    """
+    A run of consecutive crates in a stack, viewed from the bottom up. The crates are a slice of a tuple that may be
+    shared with other chunks, and are seen backwards if the chunk is reversed, so chunks never need to be copied.
+    """
+
+    crates: tuple[str, ...]
+    start: int
+    stop: int
+    reversed: bool = False
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def top(self) -> str:
+        """Returns the crate at the top of the chunk."""
+        return self.crates[self.start] if self.reversed else self.crates[self.stop - 1]
+
+    def visible(self) -> tuple[str, ...]:
+        """Returns the crates in the chunk, from the bottom up."""
+        crates = self.crates[self.start:self.stop]
+        return crates[::-1] if self.reversed else crates
+
+    def split(self, count: int) -> tuple["Chunk", "Chunk"]:
+        """Returns the chunk split into the crates under the top count crates, and those top count crates."""
+        if self.reversed:
+            return (
+                Chunk(self.crates, self.start + count, self.stop, True),
+                Chunk(self.crates, self.start, self.start + count, True),
+            )
+        return Chunk(self.crates, self.start, self.stop - count), Chunk(self.crates, self.stop - count, self.stop)
+
+    def flipped(self) -> "Chunk":
+        """Returns the chunk with its crates upside down."""
+        return Chunk(self.crates, self.start, self.stop, not self.reversed)
+
+    def joined(self, above: "Chunk") -> "Chunk":
+        """Returns the chunk with the chunk above it on top, sharing their crates if they are neighbouring slices."""
+        if self.crates is above.crates and self.reversed == above.reversed:
+            if not self.reversed and self.stop == above.start:
+                return Chunk(self.crates, self.start, above.stop)
+            if self.reversed and above.stop == self.start:
+                return Chunk(self.crates, above.start, self.stop, True)
+
+        crates = self.visible() + above.visible()
+        return Chunk(crates, 0, len(crates))
+
+
+class CrateStack:
+    """
+    A stack of crates stored as chunks, so moving a group of crates costs time proportional to the number of chunks
+    the group spans rather than the number of crates in it. Neighbouring chunks are never both smaller than
+    CHUNK_SIZE, which keeps the number of chunks in a stack within twice its height over CHUNK_SIZE.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, crates: Iterable[str] = ()) -> None:
+        crates = tuple(crates)
+        self.chunks: list[Chunk] = [Chunk(crates, 0, len(crates))] if crates else []
+
+    def top(self) -> str:
+        """Returns the crate at the top of the stack."""
+        return self.chunks[-1].top()
+
+    def push(self, chunk: Chunk) -> None:
+        """Puts the chunk on top of the stack, joining it with the chunk below if both are small."""
+        if self.chunks and len(chunk) < CHUNK_SIZE and len(self.chunks[-1]) < CHUNK_SIZE:
+            self.chunks[-1] = self.chunks[-1].joined(chunk)
+        else:
+            self.chunks.append(chunk)
+
+    def take(self, count: int) -> list[Chunk]:
+        """Removes the top count crates from the stack and returns them as chunks, from the bottom up."""
+        taken: list[Chunk] = []
+        while count:
+            chunk = self.chunks.pop()  # IndexError if the stack runs out of crates, like popping from a list
+            if len(chunk) > count:
+                chunk, top = chunk.split(count)
+                self.push(chunk)
+                chunk = top
+
+            taken.append(chunk)
+            count -= len(chunk)
+
+        taken.reverse()
+        return taken
+
+    def put(self, chunks: Iterable[Chunk]) -> None:
+        """Puts the chunks on top of the stack, from the bottom up."""
+        for chunk in chunks:
+            self.push(chunk)
 
+    def copy(self) -> "CrateStack":
+        """Returns a copy of the stack. The chunks are never changed, so the copy shares them with the original."""
+        stack = CrateStack()
+        stack.chunks = self.chunks.copy()
+        return stack
 
-def parse_stacks(crate_stacks: str) -> list[list[str]]:
+    def crates(self) -> list[str]:
+        """Returns the crates in the stack, from the bottom up."""
+        crates: list[str] = []
+        for chunk in self.chunks:
+            crates.extend(chunk.visible())
+        return crates
 
-    """Parses stacks into the actual stack representation."""
 
-    # Remove numbering
-    crate_stacks = crate_stacks.split("\n")[:-1]
+Stacks = list[CrateStack]
 
-    # Add comma delimiter
-    stacks = []
-    for line in crate_stacks:
-        new_line = ""
-        for _ in range(len(line)):
-            if (_ + 1) % 4 != 0:
-                new_line += line[_]
-            else:
-                new_line += ","
-        stacks.append(new_line.split(","))
 
-    # Make each stack its own list
-    new_stacks = []
-    for _ in range(len(stacks[0])):
-        stack = []
-        for i in range(len(stacks)):
+def parse_stacks(drawing: bytes) -> Stacks:
 
-            # Remove blank spaces
-            crate = stacks[i][_]
-            if "[" in crate:
-                stack.append(crate[1])
+    """Parses the drawing of the stacks into the actual stack representation."""
 
-        new_stacks.append(stack[::-1])  # Reverse stack so top is at end of list
+    # The numbering under the stacks tells how many there are
+    *rows, numbering = drawing.split(LINE)
+    count = len(numbering.split())
 
-    return new_stacks
+    # Crates are a letter every four characters, with spaces where stacks are not as high as others
+    levels = [row[1::4].decode().ljust(count) for row in reversed(rows)]  # Bottom of the stacks first
+    return [CrateStack(column.rstrip()) for column in map("".join, zip(*levels))]
 
 
-def apply_movements(stacks: list[list[str]], movements: list[Movement]) -> None:
+def apply_movements(stacks: Stacks, movements: list[Movement]) -> None:
 
     """Applies the movements to the stacks."""
 
-    for move in movements:
+    for num, origin, dest in movements:
 
-        # Unpack instructions
-        num, origin, dest = move
-        origin_stack = stacks[origin - 1]
-        destination_stack = stacks[dest - 1]
+        # Crates put back one at a time onto the stack they came from end up where they were
+        if origin == dest:
+            continue
 
-        # Take # of crates from destination to origin
-        for _ in range(num):
-            destination_stack.append(origin_stack.pop())
+        # Crates are moved one at a time, so the group lands upside down
+        chunks = stacks[origin - 1].take(num)
+        stacks[dest - 1].put(chunk.flipped() for chunk in reversed(chunks))
 
 
-def apply_movements_9001(stacks: list[list[str]], movements: list[Movement]) -> None:
+def apply_movements_9001(stacks: Stacks, movements: list[Movement]) -> None:
 
     """Applies the movements to the stacks, preserving the order of crates moved in groups."""
 
-    for move in movements:
+    for num, origin, dest in movements:
+        stacks[dest - 1].put(stacks[origin - 1].take(num))
 
-        # Unpack instructions
-        num, origin, dest = move
-        origin_stack = stacks[origin - 1]
-        destination_stack = stacks[dest - 1]
 
-        # Take # of crates from destination to origin
-        grouping = origin_stack[-num:]
-        stacks[origin - 1] = origin_stack[:-num]
-        destination_stack.extend(grouping)
+# Each crane model moves crates in its own way
+CRANE_MODELS: dict[int, Callable[[Stacks, list[Movement]], None]] = {
+    9000: apply_movements,
+    9001: apply_movements_9001,
+}
 
 
-# Main
-def main():
+def parse(source: Source) -> tuple[Stacks, list[Movement]]:
 
-    # Read in input
-    with open(INPUT_FILE, 'r') as file:
-        raw_data = file.read()
+    """Returns the starting crate stacks and the rearrangement procedure."""
 
-    # Split input into stacks and movements (split on empty line)
-    crate_stacks, movements = raw_data.split("\n\n")
+    instructions: list[Movement] = []
+    with open_input(source) as buffer:
 
-    # Parse stacks into lists
-    crate_stacks = parse_stacks(crate_stacks)
+        # Stacks and movements are separated by an empty line
+        blank_line = native_separator(buffer, BLANK_LINE)
+        split = buffer.find(blank_line)
 
-    # Parse movements
-    instructions: list[Movement] = []
-    for movement in movements.split("\n")[:-1]:
-        movement = movement.split(" ")
-        num, origin, destination = int(movement[1]), int(movement[3]), int(movement[5])
-        instructions.append((num, origin, destination))
+        # Parse stacks into lists
+        crate_stacks = parse_stacks(read_span(buffer, 0, split))
 
-    # Part 1
-    # After the rearrangement procedure, what crate is on the top of each stack?
-    crate_stacks_copy = []
-    for stack in crate_stacks:
-        crate_stacks_copy.append(stack.copy())
+        # Parse movements
+        for movement in lines(buffer, split + len(blank_line)):
+            movement = movement.split(b" ")
+            num, origin, destination = int(movement[1]), int(movement[3]), int(movement[5])
+            instructions.append((num, origin, destination))
+
+    return crate_stacks, instructions
+
+
+def top_crates(stacks: Stacks) -> str:
+
+    """Returns the crates at the top of each stack, with a space for stacks emptied along the way."""
+
+    return "".join(stack.top() if stack.chunks else " " for stack in stacks)
+
+
+def simulate(procedure: tuple[Stacks, list[Movement]], models: Iterable[int] = (9000, 9001)) -> dict[int, str]:
+
+    """
+    Returns the crates at the top of each stack after the rearrangement procedure for each crane model. Every model
+    starts from copies of the parsed stacks, which share their chunks with them instead of copying the crates.
+    """
+
+    crate_stacks, instructions = procedure
+    tops: dict[int, str] = {}
+    for model in models:
+        stacks = [stack.copy() for stack in crate_stacks]
+        CRANE_MODELS[model](stacks, instructions)
+        tops[model] = top_crates(stacks)
+
+    return tops
 
-    apply_movements(crate_stacks_copy, instructions)
 
-    print("The crates at the top of each stack are: ", end="")
-    for stack in crate_stacks_copy:
-        print(stack[-1], end="")
-    print()
+class Replay:
+    """
+    The rearrangement procedure carried out by one crane model, with a snapshot of the stacks kept every interval moves.
+    The stacks after any move are found by restoring the snapshot before it and replaying at most interval moves.
+    """
+
+    def __init__(
+        self, procedure: tuple[Stacks, list[Movement]], model: int = 9000, interval: int = CHECKPOINT_INTERVAL
+    ) -> None:
+
+        crate_stacks, self.movements = procedure
+        self.apply = CRANE_MODELS[model]
+        self.interval = interval
+
+        # Snapshots share their chunks with the stacks being rearranged, so each one only copies lists of chunks
+        self.checkpoints: list[Stacks] = []
+        stacks = [stack.copy() for stack in crate_stacks]
+        for move in range(0, len(self.movements) + 1, interval):
+            self.checkpoints.append([stack.copy() for stack in stacks])
+            self.apply(stacks, self.movements[move:move + interval])
+
+    def __len__(self) -> int:
+        return len(self.movements)
+
+    def stacks_after(self, move: int) -> Stacks:
+        """Returns the stacks after the given number of moves of the procedure have been made."""
+
+        if not 0 <= move <= len(self.movements):
+            raise IndexError(f"The procedure has {len(self.movements)} moves, there is no state after move {move}.")
+
+        checkpoint = move // self.interval
+        stacks = [stack.copy() for stack in self.checkpoints[checkpoint]]
+        self.apply(stacks, self.movements[checkpoint * self.interval:move])
+        return stacks
+
+    def top_crates_after(self, move: int) -> str:
+        """Returns the crates at the top of each stack after the given number of moves of the procedure."""
+        return top_crates(self.stacks_after(move))
+
+
+def part_1(procedure: tuple[Stacks, list[Movement]]) -> str:
+
+    """Returns the crates at the top of each stack after the rearrangement procedure."""
+
+    return simulate(procedure, [9000])[9000]
+
+
+def part_2(procedure: tuple[Stacks, list[Movement]]) -> str:
+
+    """Returns the crates at the top of each stack after the rearrangement procedure using the CrateMover 9001."""
+
+    return simulate(procedure, [9001])[9001]
+
+
+def solve(procedure: tuple[Stacks, list[Movement]]) -> Answers[str, str]:
+
+    """Returns the answers to both parts of the puzzle."""
+
+    tops = simulate(procedure)
+    return Answers(tops[9000], tops[9001])
+
+
+# Main
+def main(input_file: str = INPUT_FILE):
+
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # After the rearrangement procedure, what crate is on the top of each stack?
+    print(f"The crates at the top of each stack are: {answers.part_1}")
 
     # Part 2
     # After the rearrangement procedure (this time preserving the order of the group of crates moved at
     # once) what crate is on the top of each stack?
-
-    apply_movements_9001(crate_stacks, instructions)
-
-    print("The crates at the top of each stack using Crane 9001 are: ", end="")
-    for stack in crate_stacks:
-        print(stack[-1], end="")
-    print()
+    print(f"The crates at the top of each stack using Crane 9001 are: {answers.part_2}")
 
 
 if __name__ == '__main__':
@@ -2,44 +2,164 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from typing import Iterable
+
+from aoc.answers import Answers
+from aoc.inputs import LINE, SPAN_SIZE, Source, open_input
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+PACKET_MARKER: int = 4
+MESSAGE_MARKER: int = 14
+
+
+class MarkerWindow:
+    """
+    A window of characters sliding along a stream until every character in it is different. It keeps how many times
+    each character is in the window and how many different characters that makes, so each step costs the same no
+    matter the size of the window.
+    """
+
+    __slots__ = ("size", "counts", "distinct", "tail", "position", "marker")
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.counts: list[int] = [0] * 256
+        self.distinct: int = 0
+        self.tail: bytes = b""  # The characters in the window
+        self.position: int = 0  # Characters processed
+        self.marker: int | None = None  # Characters processed before the end of the marker, once found
+
+    def feed(self, chunk: bytes) -> int | None:
+        """Slides the window along the next chunk of the stream, and returns the marker position once it is found."""
+
+        if self.marker is not None:
+            return self.marker
+
+        # Characters leaving the window may come from the previous chunk
+        size, counts, distinct = self.size, self.counts, self.distinct
+        data = self.tail + chunk
+        start = len(self.tail)
+        for index in range(start, len(data)):
+            character = data[index]
+            if not counts[character]:
+                distinct += 1
+            counts[character] += 1
+
+            if index >= size:
+                leaving = data[index - size]
+                counts[leaving] -= 1
+                if not counts[leaving]:
+                    distinct -= 1
+
+            if distinct == size:
+                self.marker = self.position + index - start + 1
+                break
+
+        self.distinct = distinct
+        self.tail = data[-size:]
+        self.position += len(chunk)
+        return self.marker
+
+
+class MarkerDetector:
+    """
+    Finds the first marker of each size in a stream that arrives a chunk at a time. Only the windows are kept between
+    chunks, so the memory used does not grow with the stream.
+    """
+
+    __slots__ = ("windows",)
+
+    def __init__(self, sizes: Iterable[int] = (PACKET_MARKER, MESSAGE_MARKER)) -> None:
+        self.windows: list[MarkerWindow] = [MarkerWindow(size) for size in sorted(set(sizes))]
+
+    @property
+    def done(self) -> bool:
+        """Whether the marker of every size has been found."""
+        return all(window.marker is not None for window in self.windows)
+
+    def markers(self) -> dict[int, int]:
+        """Returns the position of the end of each marker found so far, by marker size."""
+        return {window.size: window.marker for window in self.windows if window.marker is not None}
+
+    def feed(self, chunk: bytes) -> dict[int, int]:
+        """Processes the next chunk of the stream, and returns the markers which were found in it by size."""
+        found: dict[int, int] = {}
+        for window in self.windows:
+            if window.marker is None and window.feed(chunk) is not None:
+                found[window.size] = window.marker
+        return found
+
+
+def find_markers(
+    stream: bytes, sizes: Iterable[int] = (PACKET_MARKER, MESSAGE_MARKER), block_size: int = SPAN_SIZE
+) -> dict[int, int]:
+
+    """
+    Returns the number of characters processed before the end of the first marker of each size, for the sizes that
+    have one. Every window slides along the same block of the stream before moving on, so it is read in one pass.
+    """
+
+    detector = MarkerDetector(sizes)
+    for start in range(0, len(stream), block_size):
+        detector.feed(stream[start:start + block_size])
+        if detector.done:
+            break
+
+    return detector.markers()
+
+
+def parse(source: Source) -> bytes:
+
+    """Returns the signal stream, without its line ending."""
+
+    with open_input(source) as buffer:
+        end = buffer.find(LINE)
+        return buffer[:len(buffer) if end == -1 else end].removesuffix(b"\r")
+
+
+def part_1(signal: bytes) -> int | None:
+
+    """Returns the number of characters processed before the end of the start-of-packet marker."""
+
+    return find_markers(signal, [PACKET_MARKER]).get(PACKET_MARKER)
+
+
+def part_2(signal: bytes) -> int | None:
 
+    """Returns the number of characters processed before the end of the start-of-message marker."""
 
-def index_of_packet_header(stream: str, unique_chars: int) -> int:
+    return find_markers(signal, [MESSAGE_MARKER]).get(MESSAGE_MARKER)
 
-    """Returns the index of the packet header in the signal stream."""
 
-    packet_header: list[str] = [""] * unique_chars
-    for character in stream:
+def solve(signal: bytes) -> Answers[int | None, int | None]:
 
-        if len(packet_header) == unique_chars and len(set(packet_header)) == unique_chars and "" not in packet_header:
-            packet_header = "".join(packet_header)
-            return stream.index(packet_header) + unique_chars
+    """Returns the answers to both parts of the puzzle."""
 
-        # Store last 4 characters
-        packet_header.append(character)
-        packet_header.pop(0)
+    markers = find_markers(signal)
+    return Answers(markers.get(PACKET_MARKER), markers.get(MESSAGE_MARKER))
 
 
 # Main
-def main():
+def main(input_file: str = INPUT_FILE):
 
     # Unpacking input
-    with open(INPUT_FILE, 'r') as file:
-        signal = file.read()
+    signal = parse(input_file)
+    answers = solve(signal)
 
     # Part 1
     # Detect the beginning of the packet stream and report the index at which it ends
-    header_loc = index_of_packet_header(signal, 4)
-    print(f"The packet header begins after character #{header_loc}, and it is {signal[header_loc - 4: header_loc]}")
+    header_loc = answers.part_1
+    marker = signal[header_loc - PACKET_MARKER:header_loc].decode()
+    print(f"The packet header begins after character #{header_loc}, and it is {marker}")
 
     # Part 2
     # Detect the start-of-message marker and report the index at which it ends
-    header_loc = index_of_packet_header(signal, 14)
-    print(f"The packet header begins after character #{header_loc}, and it is {signal[header_loc - 14: header_loc]}")
+    header_loc = answers.part_2
+    marker = signal[header_loc - MESSAGE_MARKER:header_loc].decode()
+    print(f"The packet header begins after character #{header_loc}, and it is {marker}")
 
 
 if __name__ == '__main__':
-    main()
+    main()
\ No newline at end of file
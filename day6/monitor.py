@@ -0,0 +1,144 @@
+# Advent of Code: Day 6 signal monitor
+__author__ = "Matteo Golin"
+
+# Imports
+import argparse
+import asyncio
+import itertools
+import os
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable
+
+from day6.day6 import MESSAGE_MARKER, PACKET_MARKER, MarkerDetector
+
+# Constants
+READ_SIZE: int = 4096  # Most characters processed for one stream before the others get a turn
+BACKLOG: int = 4096  # Connections waiting to be accepted, thousands of streams may connect at once
+
+
+@dataclass
+class MarkerEvent:
+    """A marker found in one of the monitored streams."""
+
+    stream: str
+    size: int
+    position: int  # Characters processed before the end of the marker
+
+
+async def open_pipe(path: str | os.PathLike) -> asyncio.StreamReader:
+
+    """Returns a reader for the named pipe, waiting for a writer to open it without blocking the event loop."""
+
+    loop = asyncio.get_running_loop()
+    pipe = await asyncio.to_thread(open, path, "rb", buffering=0)
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader
+
+
+class SignalMonitor:
+    """
+    Watches any number of signal streams at once and reports every marker as soon as the chunk containing it arrives.
+    Each stream is read at most READ_SIZE characters at a time, so a busy stream can't hold up the others for long, and
+    only its marker windows are kept between reads.
+    """
+
+    def __init__(self, sizes: Iterable[int] = (PACKET_MARKER, MESSAGE_MARKER)) -> None:
+        self.sizes = tuple(sizes)
+        self.events: asyncio.Queue[MarkerEvent] = asyncio.Queue()
+        self.tasks: set[asyncio.Task] = set()
+        self.connections = itertools.count(1)
+
+    async def read(self, name: str, reader: asyncio.StreamReader) -> None:
+        """Feeds the stream to a detector until every marker is found or the stream ends."""
+        detector = MarkerDetector(self.sizes)
+        while not detector.done:
+            chunk = await reader.read(READ_SIZE)
+            if not chunk:
+                break
+
+            for size, position in detector.feed(chunk).items():
+                self.events.put_nowait(MarkerEvent(name, size, position))
+
+    def watch(self, name: str, reader: asyncio.StreamReader) -> asyncio.Task:
+        """Starts watching the stream under the given name."""
+        task = asyncio.create_task(self.read(name, reader))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def watch_pipe(self, path: str | os.PathLike) -> asyncio.Task:
+        """Starts watching the named pipe, named after its path."""
+        return self.watch(os.fspath(path), await open_pipe(path))
+
+    async def listen(self, path: str | os.PathLike) -> asyncio.AbstractServer:
+        """Accepts streams on a Unix socket at the path, each connection being watched as a new stream."""
+
+        async def connected(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                await self.read(f"{os.fspath(path)}#{next(self.connections)}", reader)
+            finally:
+                writer.close()
+
+        return await asyncio.start_unix_server(connected, path, backlog=BACKLOG)
+
+    async def markers(self, server: asyncio.AbstractServer | None = None) -> AsyncIterator[MarkerEvent]:
+        """
+        Yields each marker as it is found. Without a server accepting new streams, stops once every stream being
+        watched is done.
+        """
+
+        while server is not None or self.tasks or not self.events.empty():
+            if not self.events.empty():
+                yield self.events.get_nowait()
+                continue
+
+            # Wait for the next marker, or for the last stream to finish without one
+            event = asyncio.ensure_future(self.events.get())
+            await asyncio.wait({event, *self.tasks}, return_when=asyncio.FIRST_COMPLETED)
+            if event.done():
+                yield event.result()
+            else:
+                event.cancel()
+
+
+# Main
+async def monitor(pipes: list[str], socket: str | None, sizes: list[int]) -> None:
+
+    signal_monitor = SignalMonitor(sizes)
+    server = await signal_monitor.listen(socket) if socket is not None else None
+    for pipe in pipes:
+        await signal_monitor.watch_pipe(pipe)
+
+    async for event in signal_monitor.markers(server):
+        print(f"{event.stream}: marker of size {event.size} ends after character #{event.position}", flush=True)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="day6.monitor",
+        description="Reports the markers in many signal streams as soon as they arrive.",
+    )
+    parser.add_argument("pipes", nargs="*", help="Named pipes to read signal streams from.")
+    parser.add_argument("-s", "--socket", default=None, help="Unix socket to accept signal streams on.")
+    parser.add_argument(
+        "-m", "--markers",
+        type=int,
+        nargs="+",
+        default=[PACKET_MARKER, MESSAGE_MARKER],
+        help="Sizes of the markers to look for.",
+    )
+    args = parser.parse_args()
+
+    if not args.pipes and args.socket is None:
+        parser.error("Nothing to monitor, give named pipes or a socket.")
+
+    try:
+        asyncio.run(monitor(args.pipes, args.socket, args.markers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
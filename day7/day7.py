@@ -2,129 +2,330 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from bisect import bisect_left, insort
+from typing import Iterable
+
+from aoc.answers import Answers
+from aoc.inputs import Source, lines, open_input
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 MAX_SIZE = 100_000
 DISK_SPACE = 70000000
 REQ_UNUSED_SPACE = 30000000
-
-# Types
-DirectoryList = list[str]
-File = tuple[int, str]
-FileList = list[File]
-FileStructure = dict[str, list[DirectoryList, FileList]]
+BUCKET_SIZE = 512  # Sizes per bucket of the size index, buckets are split once they grow to twice this
+SizeEntry = tuple[int, int]  # The size of a directory and its number
 
 
 # Main
-def create_file_structure(terminal_output: list[str]) -> FileStructure:
-
-    """Returns a dictionary representation of the file structure determined by the terminal output."""
-
-    file_structure: dict[str, tuple[DirectoryList, FileList]] = {}
-    current_dir = []
-    record_files: bool = False
+class Directory:
+    """A directory in the file system, which knows its parent and its subdirectories by name."""
+
+    __slots__ = ("name", "parent", "number", "children", "files", "size")
+
+    def __init__(self, name: str, parent: "Directory | None" = None, number: int = 0) -> None:
+        self.name = name
+        self.parent = parent
+        self.number = number  # Position in the order the directories were found
+        self.children: dict[str, Directory] = {}
+        self.files: int = 0  # Total size of the files directly in the directory
+        self.size: int = 0  # Total size of every file under the directory, once the sizes are added up
+
+    def path(self) -> str:
+        """Returns the absolute path of the directory."""
+        names = []
+        directory = self
+        while directory.parent is not None:
+            names.append(directory.name)
+            directory = directory.parent
+        return "/" + "/".join(reversed(names))
+
+    def child(self, name: str) -> "Directory | None":
+        """Returns the subdirectory with the name, if it has been seen."""
+        return self.children.get(name)
+
+
+class SizeIndex:
+    """
+    Directory sizes kept in sorted order while they change, so that the total of the sizes up to a limit and the
+    smallest size of at least a minimum can be found in logarithmic time. The sorted entries are split into buckets of
+    bounded length, with a Fenwick tree of prefix sums over the total size of each bucket.
+    """
+
+    __slots__ = ("buckets", "maxes", "tree")
+
+    def __init__(self, entries: Iterable[SizeEntry] = ()) -> None:
+        entries = sorted(entries)
+        self.buckets = [entries[i:i + BUCKET_SIZE] for i in range(0, len(entries), BUCKET_SIZE)]
+        self.rebuild()
+
+    def __len__(self) -> int:
+        return sum(map(len, self.buckets))
+
+    def rebuild(self) -> None:
+        """Recomputes the largest entry of each bucket and the prefix sums, after buckets were split or removed."""
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+        self.tree = [0] + [sum(size for size, _ in bucket) for bucket in self.buckets]
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def change_total(self, bucket: int, change: int) -> None:
+        """Adds the change to the total size of the bucket."""
+        i = bucket + 1
+        while i < len(self.tree):
+            self.tree[i] += change
+            i += i & -i
+
+    def total_before(self, bucket: int) -> int:
+        """Returns the total size of every bucket before the given one."""
+        total = 0
+        while bucket:
+            total += self.tree[bucket]
+            bucket -= bucket & -bucket
+        return total
+
+    def add(self, entry: SizeEntry) -> None:
+        """Adds the entry to the index."""
+        if not self.buckets:
+            self.buckets.append([entry])
+            self.rebuild()
+            return
+
+        b = min(bisect_left(self.maxes, entry), len(self.buckets) - 1)
+        bucket = self.buckets[b]
+        insort(bucket, entry)
+        self.maxes[b] = bucket[-1]
+        if len(bucket) < 2 * BUCKET_SIZE:
+            self.change_total(b, entry[0])
+        else:
+            self.buckets[b:b + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+            self.rebuild()
+
+    def remove(self, entry: SizeEntry) -> None:
+        """Removes the entry from the index."""
+        b = bisect_left(self.maxes, entry)
+        bucket = self.buckets[b]
+        del bucket[bisect_left(bucket, entry)]
+        if bucket:
+            self.maxes[b] = bucket[-1]
+            self.change_total(b, -entry[0])
+        else:
+            del self.buckets[b]
+            self.rebuild()
+
+    def replace(self, entry: SizeEntry, new: SizeEntry) -> None:
+        """Replaces the entry with a new one which sorts after it, in place when it stays in the same bucket."""
+        b = bisect_left(self.maxes, entry)
+        bucket = self.buckets[b]
+        if b + 1 < len(self.buckets) and new > self.maxes[b]:
+            self.remove(entry)
+            self.add(new)
+            return
+
+        del bucket[bisect_left(bucket, entry)]
+        insort(bucket, new)
+        self.maxes[b] = bucket[-1]
+        self.change_total(b, new[0] - entry[0])
+
+    def total_at_most(self, limit: int) -> int:
+        """Returns the total of the sizes which are at most the limit."""
+        above = (limit + 1,)  # Sorts before every entry with a size over the limit
+        b = bisect_left(self.maxes, above)
+        if b == len(self.buckets):
+            return self.total_before(b)
+
+        bucket = self.buckets[b]
+        return self.total_before(b) + sum(size for size, _ in bucket[:bisect_left(bucket, above)])
+
+    def smallest_at_least(self, minimum: int) -> SizeEntry | None:
+        """Returns the entry with the smallest size of at least the minimum, if there is one."""
+        b = bisect_left(self.maxes, (minimum,))
+        if b == len(self.buckets):
+            return None
+
+        bucket = self.buckets[b]
+        return bucket[bisect_left(bucket, (minimum,))]
+
+
+class FileSystem:
+    """
+    The tree of directories seen in a terminal session, read one line of terminal output at a time. Directories are
+    also kept in the order they were found, which always puts a directory before its subdirectories, so the tree can be
+    walked without recursion.
+    """
+
+    __slots__ = ("root", "directories", "current")
+
+    def __init__(self) -> None:
+        self.root = Directory("/")
+        self.directories: list[Directory] = [self.root]
+        self.current = self.root
+
+    def make_directory(self, parent: Directory, name: str) -> Directory:
+        """Returns the subdirectory of the parent with the name, creating it if it has not been seen."""
+        directory = parent.children.get(name)
+        if directory is None:
+            directory = Directory(name, parent, len(self.directories))
+            parent.children[name] = directory
+            self.directories.append(directory)
+        return directory
+
+    def add_file(self, directory: Directory, size: int) -> None:
+        """Adds a file of the given size to the directory."""
+        directory.files += size
+
+    def read(self, line: bytes) -> None:
+        """Follows one line of terminal output, without its new line character."""
+
+        # Directory change, the only other command is ls which is followed by its listing
+        if line.startswith(b"$ cd "):
+            directory = line[5:].decode()
+            if directory == "/":
+                self.current = self.root
+            elif directory == "..":
+                self.current = self.current.parent or self.root
+            else:
+                self.current = self.make_directory(self.current, directory)
+
+        elif line.startswith(b"$"):
+            return
+
+        # Listing of the current directory
+        elif line.startswith(b"dir "):
+            self.make_directory(self.current, line[4:].decode())
+        elif line:
+            self.add_file(self.current, int(line[:line.index(b" ")]))
+
+    def add_up_sizes(self) -> None:
+        """Sets the total size of every directory, from the deepest directories up."""
+        for directory in self.directories:
+            directory.size = directory.files
+        for directory in reversed(self.directories):
+            if directory.parent is not None:
+                directory.parent.size += directory.size
+
+    def total_at_most(self, limit: int) -> int:
+        """Returns the sum of the total sizes of the directories with a total size of at most the limit."""
+        return sum(directory.size for directory in self.directories if directory.size <= limit)
+
+    def smallest_at_least(self, minimum: int) -> Directory | None:
+        """Returns the smallest directory with a total size of at least the minimum, if there is one."""
+        options = [directory for directory in self.directories if directory.size >= minimum]
+        return min(options, key=lambda directory: directory.size, default=None)
+
+
+class IndexedFileSystem(FileSystem):
+    """
+    A file system which keeps the total size of every directory up to date as each file is listed, along with an index
+    of the sizes, so it can be queried between any two lines of terminal output. Listing a file costs one index update
+    for each directory above it.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.index = SizeIndex([(0, self.root.number)])
+
+    def make_directory(self, parent: Directory, name: str) -> Directory:
+        """Returns the subdirectory of the parent with the name, creating and indexing it if it has not been seen."""
+        found = len(self.directories)
+        directory = super().make_directory(parent, name)
+        if len(self.directories) > found:
+            self.index.add((0, directory.number))
+        return directory
+
+    def add_file(self, directory: Directory, size: int) -> None:
+        """Adds a file of the given size to the directory, updating the size of every directory containing it."""
+        directory.files += size
+        while directory is not None:
+            self.index.replace((directory.size, directory.number), (directory.size + size, directory.number))
+            directory.size += size
+            directory = directory.parent
+
+    def add_up_sizes(self) -> None:
+        """Does nothing, the sizes are always up to date."""
+
+    def total_at_most(self, limit: int) -> int:
+        """Returns the sum of the total sizes of the directories with a total size of at most the limit."""
+        return self.index.total_at_most(limit)
+
+    def smallest_at_least(self, minimum: int) -> Directory | None:
+        """Returns the smallest directory with a total size of at least the minimum, if there is one."""
+        entry = self.index.smallest_at_least(minimum)
+        return None if entry is None else self.directories[entry[1]]
+
+
+def create_file_system(terminal_output: Iterable[bytes], file_system: FileSystem | None = None) -> FileSystem:
+
+    """Returns the file system explored by the terminal output, with the total size of each directory."""
+
+    file_system = FileSystem() if file_system is None else file_system
     for line in terminal_output:
+        file_system.read(line)
 
-        # Detect command
-        if "$" in line:
+    file_system.add_up_sizes()
+    return file_system
 
-            record_files = False  # Every time a new command is processed, finish recording previous ls
-            command = line.split(" ")[1:]  # Ignore $ symbol
 
-            # Process directory change (cd command)
-            if "cd" in command:
-                directory = command[-1]
+def parse(source: Source) -> FileSystem:
 
-                if directory == "..":  # Move up
-                    current_dir.pop()
-                else:
-                    current_dir.append(directory)  # Move into directory
+    """Returns the file system explored in the terminal output, with the total size of every directory."""
 
-                    # Directory has not been seen before
-                    cur_dir_str = "/".join(current_dir)
-                    if not file_structure.get(cur_dir_str):
-                        file_structure[cur_dir_str] = [[], []]
+    # Create the file system as the terminal output is read
+    with open_input(source) as buffer:
+        return create_file_system(lines(buffer))
 
-            # ls command
-            else:
-                record_files = True
 
-        # Terminal response, only ever to ls
-        # If recording, then store all the files and directories in the current dir key
-        elif record_files:
-            info = line.split(" ")
-            cur_dir_str = "/".join(current_dir)
+def part_1(file_system: FileSystem) -> int:
 
-            # Record directory
-            if "dir" in info:
-                file_structure[cur_dir_str][0].append(f"{cur_dir_str}/{info[1]}")
+    """Returns the sum of the total sizes of the directories with a total size of at most MAX_SIZE."""
 
-            # Record file
-            else:
-                size, name = info
-                file: File = (int(size), name)
-                file_structure[cur_dir_str][1].append(file)
+    return file_system.total_at_most(MAX_SIZE)
 
-    return file_structure
 
+def smallest_deletable(file_system: FileSystem) -> Directory | None:
 
-def sum_file_sizes(file_structure: FileStructure, directory: str) -> int:
+    """Returns the smallest directory that can be deleted to free up enough space to update, if there is one."""
 
-    """Returns the total size of all the files in the directory."""
+    free_space = DISK_SPACE - file_system.root.size
+    return file_system.smallest_at_least(REQ_UNUSED_SPACE - free_space)
 
-    return sum([f[0] for f in file_structure[directory][1]])
 
+def part_2(file_system: FileSystem) -> int:
 
-def get_directory_sizes(f_struct: FileStructure, root: str, sizes: dict) -> int:
+    """Returns the size of the smallest directory that can be deleted to free up enough space to update."""
 
-    """Returns a dictionary with directories associated with their total size."""
+    smallest = smallest_deletable(file_system)
+    if smallest is None:
+        raise ValueError("No directory is large enough to free up the space needed to update.")
+    return smallest.size
 
-    children = f_struct[root][0]
-    file_total = sum_file_sizes(f_struct, root)
 
-    if not children:
-        sizes[root] = file_total
-    else:
-        sizes[root] = file_total + sum([get_directory_sizes(f_struct, child, sizes) for child in children])
+def solve(file_system: FileSystem) -> Answers[int, int]:
 
-    return sizes[root]
+    """Returns the answers to both parts of the puzzle."""
 
+    return Answers(part_1(file_system), part_2(file_system))
 
-def main():
 
-    # Unpack input
-    with open(INPUT_FILE, 'r') as file:
-        raw_data: list[str] = file.read().split("\n")[:-1]
+def main(input_file: str = INPUT_FILE):
 
-    # Create file structure
-    file_structure = create_file_structure(raw_data)
+    file_system = parse(input_file)
 
     # Part 1
     # What is the sum of the total size of the directories with a size greater than 100,000
-    dir_sizes = {}
-    get_directory_sizes(file_structure, "/", dir_sizes)
-
-    total_sizes = 0
-    for _, size in dir_sizes.items():
-        if size <= MAX_SIZE:
-            total_sizes += size
-
-    print(f"The total size of the directories with a size over 100,000 is {total_sizes}.")
+    print(f"The total size of the directories with a size over 100,000 is {part_1(file_system)}.")
 
     # Part 2
     # What is the smallest directory that can be deleted to free up enough space to update
-    options = []  # What directories are big enough to be considered
-    used_space = dir_sizes["/"]
-    free_space = DISK_SPACE - used_space
-
-    for directory, size in dir_sizes.items():
-        if size >= REQ_UNUSED_SPACE - free_space:
-            options.append((directory, size))
-
-    # What is the smallest directory that can be chosen
-    smallest = min(options, key=lambda x: x[1])
-    print(f"The smallest directory that can be deleted is {smallest[0]} with a size of {smallest[1]} ")
+    smallest = smallest_deletable(file_system)
+    if smallest is None:
+        raise ValueError("No directory is large enough to free up the space needed to update.")
+    print(f"The smallest directory that can be deleted is {smallest.path()} with a size of {smallest.size} ")
 
 
 if __name__ == '__main__':
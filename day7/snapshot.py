@@ -0,0 +1,218 @@
+# Advent of Code: Day 7 file system snapshots
+__author__ = "Matteo Golin"
+
+# Imports
+import argparse
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable
+
+from aoc.inputs import Buffer
+from day7.day7 import Directory, FileSystem, parse
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Constants
+MAGIC: bytes = b"AOC7"
+BYTE_ORDER_MARK: int = 1  # Reads as another number when the snapshot was written with the other byte order
+HEADER = struct.Struct("=4s4xqqqq")  # Magic, byte order mark, directories, names, length of the name table
+COLUMN = "q"  # Every column is an array of 64 bit integers, which keeps every section aligned
+NO_PARENT: int = -1
+
+# Snapshot layout, after the header:
+#     name offsets    (names + 1)        Where each distinct name starts in the name table, and where the last ends
+#     parents         (directories)      Number of the parent directory, NO_PARENT for the root
+#     names           (directories)      Index of the directory's name in the name offsets
+#     files           (directories)      Total size of the files directly in the directory
+#     sizes           (directories)      Total size of every file under the directory
+#     child starts    (directories + 1)  Where each directory's subdirectories start in the children column
+#     children        (directories - 1)  Numbers of the subdirectories, grouped by parent
+#     name table                         Every distinct name once, encoded as UTF-8
+# Directories are numbered in the order they were found, so a directory always comes before its subdirectories.
+
+
+def columns(file_system: FileSystem) -> tuple[list[str], dict[str, array]]:
+
+    """Returns the distinct names of the file system and its directories as columns."""
+
+    interned: dict[str, int] = {}
+    count = len(file_system.directories)
+    parents, names, files, sizes = (array(COLUMN, bytes(8 * count)) for _ in range(4))
+
+    for directory in file_system.directories:
+        number = directory.number
+        parents[number] = NO_PARENT if directory.parent is None else directory.parent.number
+        names[number] = interned.setdefault(directory.name, len(interned))
+        files[number] = directory.files
+        sizes[number] = directory.size
+
+    # Group the subdirectories by parent, keeping the order they were found in
+    child_starts = array(COLUMN, bytes(8 * (count + 1)))
+    for parent in parents[1:]:
+        child_starts[parent + 1] += 1
+    for number in range(1, count + 1):
+        child_starts[number] += child_starts[number - 1]
+
+    children = array(COLUMN, bytes(8 * max(count - 1, 0)))
+    slots = child_starts[:-1]
+    for number in range(1, count):
+        parent = parents[number]
+        children[slots[parent]] = number
+        slots[parent] += 1
+
+    return list(interned), {
+        "parents": parents,
+        "names": names,
+        "files": files,
+        "sizes": sizes,
+        "child_starts": child_starts,
+        "children": children,
+    }
+
+
+def save(file_system: FileSystem, path: str | os.PathLike) -> None:
+
+    """Writes a snapshot of the file system, with the total sizes of its directories, to the path."""
+
+    names, directories = columns(file_system)
+    encoded = [name.encode() for name in names]
+    name_offsets = array(COLUMN, [0])
+    for name in encoded:
+        name_offsets.append(name_offsets[-1] + len(name))
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, len(file_system.directories), len(names), name_offsets[-1]))
+        file.write(name_offsets.tobytes())
+        for column in directories.values():
+            file.write(column.tobytes())
+        file.write(b"".join(encoded))
+
+
+class Snapshot:
+    """
+    A file system loaded from a snapshot. The columns are read straight from the buffer, which is memory-mapped when
+    loaded from a file, so nothing is parsed or copied until a directory is looked at.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        magic, byte_order, count, name_count, table_length = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a Day 7 file system snapshot.")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError("The snapshot was written on a machine with a different byte order.")
+
+        self.buffer = buffer
+        self.count = count
+        self.view = memoryview(buffer)
+        offset = HEADER.size
+
+        def column(length: int) -> memoryview:
+            nonlocal offset
+            section = self.view[offset:offset + 8 * length].cast(COLUMN)
+            offset += 8 * length
+            return section
+
+        self.name_offsets = column(name_count + 1)
+        self.parents = column(count)
+        self.names = column(count)
+        self.files = column(count)
+        self.sizes = column(count)
+        self.child_starts = column(count + 1)
+        self.children = column(max(count - 1, 0))
+        self.name_table = self.view[offset:offset + table_length]
+        self.sizes_offset = HEADER.size + 8 * (name_count + 1 + 3 * count)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Releases the columns and unmaps the snapshot file, if it was loaded from one."""
+        for name in ["name_offsets", "parents", "names", "files", "sizes", "child_starts", "children", "name_table"]:
+            getattr(self, name).release()
+        self.view.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def name(self, number: int) -> str:
+        """Returns the name of the directory."""
+        name = self.names[number]
+        return bytes(self.name_table[self.name_offsets[name]:self.name_offsets[name + 1]]).decode()
+
+    def subdirectories(self, number: int) -> Iterable[int]:
+        """Returns the numbers of the subdirectories of the directory."""
+        return self.children[self.child_starts[number]:self.child_starts[number + 1]]
+
+    def directory(self, number: int) -> Directory:
+        """Returns the directory as a node, linked to its parents but not to its subdirectories."""
+        chain = [number]
+        while self.parents[chain[-1]] != NO_PARENT:
+            chain.append(self.parents[chain[-1]])
+
+        # Build the nodes from the root down, trees can be much deeper than the recursion limit
+        directory = None
+        for number in reversed(chain):
+            directory = Directory(self.name(number), directory, number)
+            directory.files = self.files[number]
+            directory.size = self.sizes[number]
+        return directory
+
+    @property
+    def root(self) -> Directory:
+        """Returns the root directory."""
+        return self.directory(0)
+
+    def total_at_most(self, limit: int) -> int:
+        """Returns the sum of the total sizes of the directories with a total size of at most the limit."""
+        if np is not None:
+            sizes = np.frombuffer(self.buffer, np.int64, self.count, self.sizes_offset)
+            return int(sizes[sizes <= limit].sum())
+        return sum(size for size in self.sizes if size <= limit)
+
+    def smallest_at_least(self, minimum: int) -> Directory | None:
+        """Returns the smallest directory with a total size of at least the minimum, if there is one."""
+        if np is not None:
+            sizes = np.frombuffer(self.buffer, np.int64, self.count, self.sizes_offset)
+            options = np.flatnonzero(sizes >= minimum)
+            return self.directory(int(options[sizes[options].argmin()])) if len(options) else None
+
+        options = [number for number, size in enumerate(self.sizes) if size >= minimum]
+        return self.directory(min(options, key=self.sizes.__getitem__)) if options else None
+
+
+def load(path: str | os.PathLike) -> Snapshot:
+
+    """Returns the snapshot at the path, memory-mapped rather than read."""
+
+    with open(path, "rb") as file:
+        return Snapshot(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# Main
+def main():
+
+    parser = argparse.ArgumentParser(
+        prog="day7.snapshot",
+        description="Parses a terminal transcript once and saves the file system it explores as a snapshot.",
+    )
+    parser.add_argument("transcript", help="Terminal output to parse.")
+    parser.add_argument("snapshot", help="File to write the snapshot to.")
+    args = parser.parse_args()
+
+    file_system = parse(args.transcript)
+    save(file_system, args.snapshot)
+    print(f"Saved {len(file_system.directories)} directories to {args.snapshot}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,77 +2,361 @@
 __author__ = "Matteo Golin"
 
 # Imports
-import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from multiprocessing.shared_memory import SharedMemory
+from operator import mul, or_
+from typing import Iterator, Sequence
+
+from aoc.answers import Answers
+from aoc.inputs import LINE, Source, open_input
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
+HEIGHTS: bytes = bytes.maketrans(b"0123456789", bytes(range(10)))  # Digits translated to the heights they stand for
+MAX_HEIGHT: int = 9
+BAND_SIZE: int = 1 << 16  # Trees swept at once by numpy, small enough for its intermediate arrays to stay in cache
+TILES_PER_WORKER: int = 4  # Bands of rows or columns per worker, so the sweep isn't held up by one large band
+
+# Types
 Coordinates = tuple[int, int]
+BestTree = tuple[Coordinates, int]  # The coordinates of the tree with the highest scenic score, and the score
+Survey = tuple[int, BestTree]  # The number of visible trees, and the best tree
+
+
+@dataclass
+class Forest:
+    """The tree heights of the forest, stored row after row in one flat array."""
+
+    heights: bytearray
+    width: int
+    height: int
+
+    def row(self, y: int) -> bytearray:
+        """Returns the heights of the trees in the row."""
+        return self.heights[y * self.width:(y + 1) * self.width]
+
+    def column(self, x: int) -> bytearray:
+        """Returns the heights of the trees in the column."""
+        return self.heights[x::self.width]
+
+    def grid(self) -> "np.ndarray":
+        """Returns the heights as a 2D numpy array, without copying them."""
+        return np.frombuffer(self.heights, np.uint8).reshape(self.height, self.width)
+
+
+@dataclass
+class SharedViews:
+    """
+    The names of the shared memory blocks holding the tree heights, and the views along the rows and along the columns
+    which the workers fill in. Column views are indexed by column first.
+    """
+
+    width: int
+    height: int
+    heights: str
+    row_visible: str
+    row_scores: str
+    column_visible: str
+    column_scores: str
+
+    def blocks(self) -> list[tuple[str, str, tuple[int, int]]]:
+        """Returns the name, data type and shape of each block."""
+        rows, columns = (self.height, self.width), (self.width, self.height)
+        return [
+            (self.heights, "uint8", rows),
+            (self.row_visible, "bool", rows),
+            (self.row_scores, "int32", rows),
+            (self.column_visible, "bool", columns),
+            (self.column_scores, "int32", columns),
+        ]
 
 
 # Main
-def main():
+def read_forest(source: Source) -> Forest:
 
-    # Unpack input
-    with open(INPUT_FILE, 'r') as file:
-        raw_data = file.read().split("\n")[:-1]  # Ignore blank final line
+    """Returns the tree heights in the forest."""
 
-    # 2D array representation
-    forest = []
-    for row in raw_data:
-        forest.append([int(tree) for tree in row])
+    with open_input(source) as buffer:
+        end = buffer.find(LINE)
+        first_row = buffer[:len(buffer) if end == -1 else end].translate(HEIGHTS, b"\r\n")
+        heights = bytearray(buffer[:].translate(HEIGHTS, b"\r\n"))
+
+    width = len(first_row)
+    return Forest(heights, width, len(heights) // width if width else 0)
+
+
+def line_views(heights: Sequence[int]) -> tuple[list[bool], list[int]]:
+
+    """
+    Returns whether each tree in the line can be seen from either end, and the product of how far it can see towards
+    both ends. The trees which could still block the view are kept on a stack of decreasing heights, so each tree is
+    pushed and popped at most once per direction.
+    """
+
+    length = len(heights)
+    visible = [False] * length
+    scores = [0] * length
+
+    # Looking towards the start of the line
+    stack: list[int] = []
+    for i, tree in enumerate(heights):
+        while stack and heights[stack[-1]] < tree:
+            stack.pop()
+        visible[i] = not stack
+        scores[i] = i - stack[-1] if stack else i
+        stack.append(i)
+
+    # Looking towards the end of the line
+    stack.clear()
+    for i in range(length - 1, -1, -1):
+        tree = heights[i]
+        while stack and heights[stack[-1]] < tree:
+            stack.pop()
+        visible[i] = visible[i] or not stack
+        scores[i] *= stack[-1] - i if stack else length - 1 - i
+        stack.append(i)
+
+    return visible, scores
+
+
+def viewing_distances(grid: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+
+    """
+    Returns whether each tree can be seen from the start of its row, and how far it can see towards the start. Heights
+    are single digits, so instead of a stack per row, each height is swept over every row at once with a running
+    maximum of the positions of the trees at least that tall. Positions are numbered across the whole grid, so the
+    positions from earlier rows are never after the start of the current row.
+    """
+
+    rows, width = grid.shape
+    heights = np.ascontiguousarray(grid).ravel()
+    positions = np.arange(1, heights.size + 1, dtype=np.int32)
+    blockers = np.zeros(heights.size, np.int32)
+    trees = np.empty(heights.size, bool)
+    last = np.empty(heights.size, np.int32)
+    blocked = np.empty(heights.size, np.int32)
+    for height in range(MAX_HEIGHT + 1):
+
+        # Position of the last tree at least this tall up to each tree, numbered from 1 with 0 for none
+        np.greater_equal(heights, height, out=trees)
+        np.multiply(trees, positions, out=last)
+        np.maximum.accumulate(last, out=last)
+
+        # Trees of this height are blocked by the last such tree before them
+        np.equal(heights[1:], height, out=trees[1:])
+        np.multiply(trees[1:], last[:-1], out=blocked[1:])
+        blockers[1:] += blocked[1:]
+
+    # Blockers before the start of the row don't block anything, the tree sees all the way to the edge
+    blockers = blockers.reshape(rows, width) - (np.arange(rows, dtype=np.int32) * width)[:, None]
+    return blockers <= 0, np.arange(width, dtype=np.int32) - np.maximum(blockers - 1, 0)
+
+
+def band_views(grid: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+
+    """
+    Returns whether each tree can be seen from either end of its row, and the product of how far it can see towards
+    both ends, sweeping a band of rows at a time.
+    """
+
+    visible = np.empty(grid.shape, bool)
+    scores = np.empty(grid.shape, np.int32)
+    rows = max(1, BAND_SIZE // max(1, grid.shape[1]))
+    for start in range(0, grid.shape[0], rows):
+        band = grid[start:start + rows]
+        left_visible, left = viewing_distances(band)
+        right_visible, right = viewing_distances(band[:, ::-1])
+        np.logical_or(left_visible, right_visible[:, ::-1], out=visible[start:start + rows])
+        np.multiply(left, right[:, ::-1], out=scores[start:start + rows])
+
+    return visible, scores
+
+
+def combine_views(
+    row_visible: "np.ndarray", row_scores: "np.ndarray", column_visible: "np.ndarray", column_scores: "np.ndarray"
+) -> Survey:
+
+    """
+    Returns the survey of the forest from the views along the rows and along the columns, the column views being
+    indexed by column first.
+    """
 
-    # Part 1
-    # How many trees are visible from outside the grid
-    # Loop through forest excluding edges
     visible = 0
-    outer_trees = len(forest[0]) * 2 + len(forest) * 2 - 4
-    for y in range(1, len(forest) - 1):
-        for x in range(1, len(forest[0]) - 1):
+    best: BestTree = ((0, 0), 0)
+    height, width = row_visible.shape
+    rows = max(1, BAND_SIZE // max(1, width))
+    for start in range(0, height, rows):
+        stop = min(start + rows, height)
+        visible += int(np.count_nonzero(row_visible[start:stop] | column_visible[:, start:stop].T))
+
+        scores = row_scores[start:stop].astype(np.int64) * column_scores[:, start:stop].T
+        tree = int(scores.argmax()) if scores.size else 0
+        if scores.size and scores.flat[tree] > best[1]:
+            y, x = divmod(tree, width)
+            best = ((x, start + y), int(scores.flat[tree]))
+
+    return visible, best
+
+
+def survey(forest: Forest) -> Survey:
+
+    """
+    Returns the number of trees visible from outside the grid, and the tree with the highest scenic score. Every row and
+    every column is swept once in each direction, so it runs in time proportional to the number of trees.
+    """
 
-            tree = forest[y][x]
-            row = forest[y]
-            column = [forest[_][x] for _ in range(len(forest))]
+    if np is not None:
+        grid = forest.grid()
+        return combine_views(*band_views(grid), *band_views(np.ascontiguousarray(grid.T)))
 
-            # Visible from left or right
-            if max(row[:x]) < tree or max(row[x + 1:]) < tree:
-                visible += 1
+    # Views along the rows, then combined with the views along the columns
+    width = forest.width
+    visible = bytearray()
+    scores: list[int] = []
+    for y in range(forest.height):
+        row_visible, row_scores = line_views(forest.row(y))
+        visible += bytes(row_visible)
+        scores += row_scores
 
-            # Visible from top or bottom
-            elif max(column[:y]) < tree or max(column[y + 1:]) < tree:
-                visible += 1
+    for x in range(width):
+        column_visible, column_scores = line_views(forest.column(x))
+        visible[x::width] = bytes(map(or_, visible[x::width], column_visible))
+        scores[x::width] = map(mul, scores[x::width], column_scores)
 
-    print(f"The number of trees visible from the outside of the grid is {visible + outer_trees}.")
+    best = max(range(len(scores)), key=scores.__getitem__, default=0)
+    return sum(visible), ((best % width, best // width) if scores else (0, 0), scores[best] if scores else 0)
+
+
+def tiles(length: int, count: int) -> Iterator[tuple[int, int]]:
+
+    """Yields the (start, stop) ranges splitting the length into at most the given number of tiles."""
+
+    size = -(-length // max(1, count))
+    for start in range(0, length, max(1, size)):
+        yield start, min(start + size, length)
+
+
+def shared_arrays(views: SharedViews, memory: list[SharedMemory]) -> list["np.ndarray"]:
+
+    """Returns the arrays over each of the shared memory blocks of the views."""
+
+    return [np.ndarray(shape, dtype, block.buf) for block, (_, dtype, shape) in zip(memory, views.blocks())]
+
+
+def tile_views(views: SharedViews, columns: bool, start: int, stop: int) -> None:
+
+    """Sweeps the rows, or the columns, from start to stop of the shared forest and writes their views back to it."""
+
+    memory = [SharedMemory(name) for name, _, _ in views.blocks()]
+    arrays: list[np.ndarray] = []
+    grid = row_visible = row_scores = column_visible = column_scores = None
+    try:
+        arrays = shared_arrays(views, memory)
+        grid, row_visible, row_scores, column_visible, column_scores = arrays
+        if columns:
+            band = np.ascontiguousarray(grid[:, start:stop].T)
+            column_visible[start:stop], column_scores[start:stop] = band_views(band)
+        else:
+            row_visible[start:stop], row_scores[start:stop] = band_views(grid[start:stop])
+
+    # The arrays must be gone before the memory under them can be closed
+    finally:
+        del grid, row_visible, row_scores, column_visible, column_scores
+        arrays.clear()
+        for block in memory:
+            block.close()
+
+
+def parallel_survey(forest: Forest, workers: int) -> Survey:
+
+    """
+    Returns the same survey as a single process, with the sweeps split between worker processes. The heights are copied
+    once into shared memory, workers sweep tiles of whole rows and then of whole columns, writing their views into
+    shared memory too, and the views are combined as they would be for one process.
+    """
+
+    # Shared memory is only useful through numpy arrays
+    if np is None or workers < 2:
+        return survey(forest)
+
+    cells = forest.width * forest.height
+    memory = [SharedMemory(create=True, size=max(1, cells * size)) for size in (1, 1, 4, 1, 4)]
+    arrays: list[np.ndarray] = []
+    try:
+        views = SharedViews(forest.width, forest.height, *(block.name for block in memory))
+        arrays = shared_arrays(views, memory)
+        arrays[0][...] = forest.grid()
+
+        row_tiles = list(tiles(forest.height, workers * TILES_PER_WORKER))
+        column_tiles = list(tiles(forest.width, workers * TILES_PER_WORKER))
+        columns = [False] * len(row_tiles) + [True] * len(column_tiles)
+        starts, stops = zip(*row_tiles, *column_tiles) if columns else ((), ())
+        with ProcessPoolExecutor(workers) as executor:
+            list(executor.map(tile_views, repeat(views), columns, starts, stops))
+
+        return combine_views(*arrays[1:])
+
+    finally:
+        arrays.clear()
+        for block in memory:
+            block.close()
+            block.unlink()
+
+
+def parse(source: Source) -> Forest:
+
+    """Returns the tree heights in the forest."""
+
+    return read_forest(source)
+
+
+def part_1(forest: Forest, workers: int = 1) -> int:
+
+    """
+    Returns the number of trees visible from outside the grid. The sweeps are split between the given number of worker
+    processes.
+    """
+
+    return parallel_survey(forest, workers)[0]
+
+
+def part_2(forest: Forest, workers: int = 1) -> int:
+
+    """
+    Returns the highest scenic score possible for any tree in the forest. The sweeps are split between the given number
+    of worker processes.
+    """
+
+    return parallel_survey(forest, workers)[1][1]
+
+
+def solve(forest: Forest, workers: int = 1) -> Answers[int, int]:
+
+    """Returns the answers to both parts of the puzzle, surveying the forest only once."""
+
+    visible, (_, best_score) = parallel_survey(forest, workers)
+    return Answers(visible, best_score)
+
+
+def main(input_file: str = INPUT_FILE):
+
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # How many trees are visible from outside the grid
+    print(f"The number of trees visible from the outside of the grid is {answers.part_1}.")
 
     # Part 2
     # What is the highest scenic score possible for any tree in the forest
-    best_tree: tuple[Coordinates, int] = ((0, 0), 0)
-    for y in range(1, len(forest) - 1):
-        for x in range(1, len(forest[0]) - 1):
-
-            scores = [0] * 4  # Record scores
-
-            tree = forest[y][x]
-            row = forest[y]
-            column = [forest[_][x] for _ in range(len(forest))]
-
-            directions = [
-                column[y + 1:],  # Look down
-                list(reversed(row[:x])),  # Look left
-                list(reversed(column[:y])),  # Look up
-                row[x + 1:],  # Look right
-            ]
-
-            for i in range(len(directions)):
-                for other_tree in directions[i]:
-                    scores[i] += 1
-                    if other_tree >= tree:
-                        break
-
-            score = math.prod(scores)
-            if score > best_tree[1]:
-                best_tree = ((x, y), score)
-
-    print(f"The highest possible scenic score is {best_tree[1]}.")
+    print(f"The highest possible scenic score is {answers.part_2}.")
 
 
 if __name__ == '__main__':
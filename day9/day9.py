@@ -2,160 +2,307 @@
 __author__ = "Matteo Golin"
 
 # Imports
+import os
+from abc import ABC, abstractmethod
+from array import array
+from itertools import repeat
+from typing import Callable, Iterable
+
+from aoc.answers import Answers
+from aoc.inputs import Source, lines, open_input
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Constants
-INPUT_FILE = "./input.txt"
+INPUT_FILE = os.path.join(os.path.dirname(__file__), "input.txt")
 Coordinates = tuple[int, int]
-Region = list[list[str]]
-
-# Movement directions
-MOVEMENTS: dict[str, Coordinates] = {
-    "R": (1, 0),
-    "L": (-1, 0),
-    "U": (0, -1),
-    "D": (0, 1)
+Move = tuple[int, int, int]  # The step the head takes in x and y, and how many times it takes it
+START: Coordinates = (0, 4)
+SHORT_ROPE: int = 2
+LONG_ROPE: int = 10
+TILE_BITS: int = 6  # Tiles of the visited cell bitmap are 64 by 64 cells
+TILE_MASK: int = (1 << TILE_BITS) - 1
+TILE_BYTES: int = 1 << (2 * TILE_BITS - 3)
+COMPACT_SIZE: int = 1 << 16  # Packed cells are only deduplicated once this many have been added
+
+# Movement directions, by the byte naming them
+MOVEMENTS: dict[int, Coordinates] = {
+    ord("R"): (1, 0),
+    ord("L"): (-1, 0),
+    ord("U"): (0, -1),
+    ord("D"): (0, 1),
 }
 
-# Surrounding 8 cell vectors
-SURROUNDING: dict[str, Coordinates] = {
-    "left": (-1, 0),
-    "right": (1, 0),
-    "top-left": (-1, -1),
-    "bottom-left": (-1, 1),
-    "bottom-right": (1, 1),
-    "top-right": (1, -1),
-    "up": (0, -1),
-    "down": (0, 1),
-    "on": (0, 0),
-}
 
-# Maps head locations to how tail should move
-HEAD_SPOTS: dict[Coordinates, str] = {
-    (0, -2): "up",
-    (0, 2): "down",
-    (-2, 0): "left",
-    (2, 0): "right",
-    (-2, -1): "top-left",
-    (-1, -2): "top-left",
-    (-2, -2): "top-left",
-    (1, -2): "top-right",
-    (2, -1): "top-right",
-    (2, -2): "top-right",
-    (-2, 1): "bottom-left",
-    (-1, 2): "bottom-left",
-    (-2, 2): "bottom-left",
-    (2, 1): "bottom-right",
-    (1, 2): "bottom-right",
-    (2, 2): "bottom-right",
+# Main
+def pack(x: int, y: int) -> int:
+
+    """Returns the coordinates packed into one 64 bit integer, for coordinates within 32 bit range."""
+
+    return (x << 32) + y
+
+
+class VisitedCells(ABC):
+    """The distinct cells visited by a knot. Subclasses decide how the cells are stored."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def add(self, x: int, y: int) -> None:
+        """Marks the cell as visited."""
+
+    def add_line(self, x: int, y: int, dx: int, dy: int, amount: int) -> None:
+        """Marks the given number of cells after (x, y) along the step as visited."""
+        for _ in range(amount):
+            x += dx
+            y += dy
+            self.add(x, y)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Returns the number of distinct cells visited."""
+
+
+class CellSet(VisitedCells):
+    """Visited cells as a set of coordinates, the fastest to add to but over a hundred bytes per cell."""
+
+    __slots__ = ("cells",)
+
+    def __init__(self) -> None:
+        self.cells: set[Coordinates] = set()
+
+    def add(self, x: int, y: int) -> None:
+        self.cells.add((x, y))
+
+    def add_line(self, x: int, y: int, dx: int, dy: int, amount: int) -> None:
+        xs = range(x + dx, x + dx * (amount + 1), dx) if dx else repeat(x, amount)
+        ys = range(y + dy, y + dy * (amount + 1), dy) if dy else repeat(y, amount)
+        self.cells.update(zip(xs, ys))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+
+class PackedCells(VisitedCells):
+    """
+    Visited cells as packed 64 bit integers in an array, which is sorted and rid of duplicates whenever it has doubled in
+    length. Costs 8 bytes per cell, plus the duplicates added since the last time.
+    """
+
+    __slots__ = ("keys", "distinct", "limit")
+
+    def __init__(self) -> None:
+        self.keys = array("q")
+        self.distinct = 0  # Length of the array when it was last deduplicated
+        self.limit = COMPACT_SIZE
+
+    def add(self, x: int, y: int) -> None:
+        keys = self.keys
+        keys.append(pack(x, y))
+        if len(keys) >= self.limit:
+            self.compact()
+
+    def compact(self) -> None:
+        """Sorts the keys and removes the duplicates."""
+        if np is not None:
+            keys = np.sort(np.frombuffer(self.keys, np.int64))
+            self.keys = array("q", keys[np.append(True, keys[1:] != keys[:-1])].tobytes())
+        else:
+            self.keys = array("q", sorted(set(self.keys)))
+        self.distinct = len(self.keys)
+        self.limit = 2 * max(self.distinct, COMPACT_SIZE)
+
+    def __len__(self) -> int:
+        if len(self.keys) > self.distinct:
+            self.compact()
+        return self.distinct
+
+
+class TileBitmap(VisitedCells):
+    """
+    Visited cells as a sparse bitmap, one bit per cell in square tiles which are only created once one of their cells is
+    visited. A random walk visits most cells of the tiles it passes through, so this costs a few bits per cell.
+    """
+
+    __slots__ = ("tiles", "count")
+
+    def __init__(self) -> None:
+        self.tiles: dict[int, bytearray] = {}
+        self.count = 0
+
+    def add(self, x: int, y: int) -> None:
+        key = pack(x >> TILE_BITS, y >> TILE_BITS)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = bytearray(TILE_BYTES)
+
+        cell = ((y & TILE_MASK) << TILE_BITS) | (x & TILE_MASK)
+        bit = 1 << (cell & 7)
+        if not tile[cell >> 3] & bit:
+            tile[cell >> 3] |= bit
+            self.count += 1
+
+    def __len__(self) -> int:
+        return self.count
+
+
+BACKENDS: dict[str, Callable[[], VisitedCells]] = {
+    "set": CellSet,
+    "packed": PackedCells,
+    "tiles": TileBitmap,
 }
 
 
-# Main
-def add_points(start: Coordinates, translation: Coordinates) -> Coordinates:
+class Rope:
+    """
+    A rope with any number of knots, the first being the head. The coordinates of the knots are kept in two flat lists
+    of integers rather than as a tuple per knot.
+    """
 
-    """Returns the sum of two points."""
+    __slots__ = ("xs", "ys")
 
-    return start[0] + translation[0], start[1] + translation[1]
+    def __init__(self, knots: int, start: Coordinates = START) -> None:
+        if knots < 1:
+            raise ValueError(f"A rope needs at least one knot, but {knots} were asked for.")
 
+        self.xs = [start[0]] * knots
+        self.ys = [start[1]] * knots
 
-def subtract_points(first: Coordinates, second: Coordinates) -> Coordinates:
+    def __len__(self) -> int:
+        return len(self.xs)
 
-    """Returns the difference between two coordinates."""
+    def knot(self, i: int) -> Coordinates:
+        """Returns the coordinates of the knot."""
+        return self.xs[i], self.ys[i]
 
-    return first[0] - second[0], first[1] - second[1]
+    def move(self, dx: int, dy: int, amount: int, trails: list[tuple[int, VisitedCells]]) -> None:
 
+        """
+        Moves the head by the step the given number of times, marking each cell reached by a knot as visited in its
+        trail. Each knot steps towards the one before it by the sign of their difference on each axis, and once a knot
+        is close enough not to move, none of the knots after it can move either.
+        """
 
-def print_region(region: Region) -> None:
+        xs, ys = self.xs, self.ys
+        knots = len(xs)
+        while amount > 0:
+            x = xs[0] + dx
+            y = ys[0] + dy
+            xs[0] = x
+            ys[0] = y
+            amount -= 1
 
-    """Prints the region."""
+            moved = knots
+            for i in range(1, knots):
+                ddx = x - xs[i]
+                ddy = y - ys[i]
+                if -1 <= ddx <= 1 and -1 <= ddy <= 1:
+                    moved = i
+                    break
 
-    for row in region:
-        for column in row:
-            print(column, end="")
-        print()
+                x = xs[i] + (ddx > 0) - (ddx < 0)
+                y = ys[i] + (ddy > 0) - (ddy < 0)
+                xs[i] = x
+                ys[i] = y
 
+            # Only the knots which moved can visit somewhere new
+            for knot, trail in trails:
+                if knot < moved:
+                    trail.add(xs[knot], ys[knot])
 
-def calculate_tail(head: Coordinates, tail: Coordinates) -> Coordinates:
+            # Once the rope lies straight behind the head, every knot takes the same step as the head until the end of
+            # the move, so the whole rope is shifted in one go
+            if moved == knots and amount and all(
+                xs[i - 1] - xs[i] == dx and ys[i - 1] - ys[i] == dy for i in range(1, knots)
+            ):
+                for knot, trail in trails:
+                    trail.add_line(xs[knot], ys[knot], dx, dy, amount)
 
-    """Returns the new tail position."""
+                for i in range(knots):
+                    xs[i] += amount * dx
+                    ys[i] += amount * dy
+                amount = 0
 
-    # If the tail is touching the head in any capacity, it does not move
-    difference = subtract_points(head, tail)
-    for cell in SURROUNDING.values():
-        if difference == cell:
-            return tail
 
-    # Calculate move
-    move = HEAD_SPOTS[difference]
-    move = SURROUNDING[move]
+def visited_cells(
+    moves: list[Move],
+    knots: int,
+    tracked: Iterable[int] = (-1,),
+    backend: Callable[[], VisitedCells] = TileBitmap,
+) -> list[VisitedCells]:
 
-    return add_points(tail, move)
+    """
+    Returns the cells visited by each of the tracked knots of a rope with the given number of knots, counting from the
+    head or from the tail for negative numbers.
+    """
 
+    rope = Rope(knots)
+    trails = [(knot % knots, backend()) for knot in tracked]
+    for knot, trail in trails:
+        trail.add(*rope.knot(knot))
 
-def main():
+    for dx, dy, amount in moves:
+        rope.move(dx, dy, amount, trails)
+
+    return [trail for _, trail in trails]
+
+
+def simulate(moves: list[Move], knots: int, backend: Callable[[], VisitedCells] = TileBitmap) -> int:
+
+    """Returns the number of positions the tail of a rope with the given number of knots visits at least once."""
+
+    return len(visited_cells(moves, knots, backend=backend)[0])
+
+
+def parse(source: Source) -> list[Move]:
+
+    """Returns the list of head movements."""
 
-    # Read input
     moves = []
-    with open(INPUT_FILE, 'r') as file:
-        for line in file:
-            direction, amount = line.strip().split(" ")
-            moves.append((direction, int(amount)))
+    with open_input(source) as buffer:
+        for line in lines(buffer):
+            dx, dy = MOVEMENTS[line[0]]
+            moves.append((dx, dy, int(line[2:])))
 
-    # Create bridge environment
-    region: Region = [["." for _ in range(6)] for _ in range(5)]
-    start: Coordinates = (0, 4)
-    region[4][0] = "s"
+    return moves
 
-    # Part 1
-    # How many positions does the tail touch at least once
-    head: Coordinates = start  # Head and tail begin at the start
-    tail: Coordinates = start
 
-    # Simulate movement
-    tail_positions = {start}
-    for move in moves:
+def part_1(moves: list[Move]) -> int:
 
-        # Unpacking data
-        direction, amount = move
-        direction = MOVEMENTS[direction]
+    """Returns the number of positions the tail visits at least once."""
 
-        # Move head and then calculate how the tail moves in response
-        for _ in range(amount):
+    return simulate(moves, SHORT_ROPE)
 
-            head = add_points(head, direction)
 
-            tail = calculate_tail(head, tail)
+def part_2(moves: list[Move], length: int = LONG_ROPE) -> int:
 
-            # Record tail
-            tail_positions.add(tail)
+    """Returns the number of positions the tail of a rope with the given length visits at least once."""
 
-    print(f"The tail visited {len(tail_positions)} places at least once.")
+    return simulate(moves, length)
 
-    # Part 2
-    # How many positions does the tail of rope length 10 touch at least once
-    length: int = 10
-    rope: list[Coordinates] = [start for _ in range(length)]
-    tail_positions = {start}
-    for move in moves:
 
-        # Unpacking data
-        direction, amount = move
-        direction = MOVEMENTS[direction]
+def solve(moves: list[Move]) -> Answers[int, int]:
 
-        # Move head and then calculate how the tail moves in response
-        for _ in range(amount):
+    """Returns the answers to both parts of the puzzle."""
 
-            # Update head
-            rope[0] = add_points(rope[0], direction)
+    return Answers(part_1(moves), part_2(moves))
 
-            # Calculate movement for each segment behind the head
-            for _ in range(1, len(rope[1:]) + 1):
-                rope[_] = calculate_tail(rope[_ - 1], rope[_])
 
-            # Record positions
-            tail_positions.add(rope[-1])
+def main(input_file: str = INPUT_FILE):
 
-    print(f"The tail of length {length} visited {len(tail_positions)} places at least once.")
+    # Read input
+    answers = solve(parse(input_file))
+
+    # Part 1
+    # How many positions does the tail touch at least once
+    print(f"The tail visited {answers.part_1} places at least once.")
+
+    # Part 2
+    # How many positions does the tail of rope length 10 touch at least once
+    print(f"The tail of length 10 visited {answers.part_2} places at least once.")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,38 @@
+# Advent of Code: Day 4 tests
+__author__ = "Matteo Golin"
+
+# Imports
+import random
+
+import pytest
+
+from day4 import day4
+
+
+def random_range(rng: random.Random) -> tuple[int, int]:
+
+    """Returns a random range of sections."""
+
+    start = rng.randrange(100)
+    return start, start + rng.randrange(20)
+
+
+@pytest.mark.parametrize("count", [0, 1, 2, 7, 8, 9, 64, 300])
+def test_interval_index_matches_scan(count):
+    rng = random.Random(count)
+    pairs = [(random_range(rng), random_range(rng)) for _ in range(count)]
+    index = day4.IntervalIndex(pairs)
+
+    # Every assignment, in the order of their start section and then of their pair
+    assignments = sorted(
+        ((number, section_range) for number, pair in enumerate(pairs) for section_range in pair),
+        key=lambda assignment: assignment[1][0],
+    )
+    assert len(index) == len(assignments)
+
+    for _ in range(200):
+        start, end = random_range(rng)
+        expected = [(number, (first, last)) for number, (first, last) in assignments if first <= end and start <= last]
+        assert index.overlapping(start, end) == expected
+        assert index.count_overlapping(start, end) == len(expected)
+        assert index.containing(start) == sum(first <= start <= last for _, (first, last) in assignments)
@@ -0,0 +1,57 @@
+# Advent of Code: Day 5 tests
+__author__ = "Matteo Golin"
+
+# Imports
+import random
+from string import ascii_uppercase
+
+import pytest
+
+from day5 import day5
+
+
+def test_move_onto_the_same_stack():
+    drawing = b"[E]\n[C]\n[C]\n[D]\n[D]\n[A]\n 1 \n\n"
+    tops = day5.simulate(day5.parse(drawing + b"move 2 from 1 to 1\n"))
+    assert tops == {9000: "E", 9001: "E"}
+
+
+def move_one_at_a_time(stacks: list[list[str]], movements: list[day5.Movement], model: int) -> None:
+
+    """Applies the movements to stacks of plain lists, the way each crane model is described in the puzzle."""
+
+    for num, origin, dest in movements:
+        if model == 9000:
+            for _ in range(num):
+                stacks[dest - 1].append(stacks[origin - 1].pop())
+        else:
+            group = stacks[origin - 1][-num:]
+            del stacks[origin - 1][-num:]
+            stacks[dest - 1].extend(group)
+
+
+@pytest.mark.parametrize("model", [9000, 9001])
+@pytest.mark.parametrize("seed", range(3))
+def test_replay_matches_moving_crates_one_at_a_time(monkeypatch, model, seed):
+    monkeypatch.setattr(day5, "CHUNK_SIZE", 2)  # Chunks are split, flipped and joined on every move
+    rng = random.Random(seed)
+    stacks = [[rng.choice(ascii_uppercase) for _ in range(rng.randrange(8))] for _ in range(5)]
+
+    movements: list[day5.Movement] = []
+    heights = [len(stack) for stack in stacks]
+    for _ in range(60):
+        origin = rng.choice([number for number, height in enumerate(heights) if height])
+        dest = rng.randrange(len(stacks))
+        num = rng.randint(1, heights[origin])
+        heights[origin] -= num
+        heights[dest] += num
+        movements.append((num, origin + 1, dest + 1))
+
+    replay = day5.Replay(([day5.CrateStack(stack) for stack in stacks], movements), model, interval=7)
+    for move in rng.sample(range(len(movements) + 1), len(movements) + 1):
+        expected = [stack.copy() for stack in stacks]
+        move_one_at_a_time(expected, movements[:move], model)
+        assert [stack.crates() for stack in replay.stacks_after(move)] == expected
+
+    with pytest.raises(IndexError):
+        replay.stacks_after(len(movements) + 1)
@@ -0,0 +1,76 @@
+# Advent of Code: Day 7 tests
+__author__ = "Matteo Golin"
+
+# Imports
+import random
+
+import pytest
+
+from aoc.generators import terminal_output
+from day7 import day7
+
+# Constants
+TRANSCRIPT_SIZE: int = 1 << 14
+CHECK_INTERVAL: int = 97  # Lines of terminal output between comparisons with a file system parsed from scratch
+
+
+@pytest.fixture(autouse=True)
+def small_buckets(monkeypatch):
+    # Buckets only split above a thousand directories, small buckets put every path through a few hundred
+    monkeypatch.setattr(day7, "BUCKET_SIZE", 4)
+
+
+def limits(sizes: list[int], rng: random.Random) -> list[int]:
+
+    """Returns limits on and around a sample of the sizes, along with limits below and above all of them."""
+
+    sample = rng.sample(sizes, min(len(sizes), 10))
+    return [-1, 0, max(sizes) + 1] + [size + offset for size in sample for offset in (-1, 0, 1)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_size_index_matches_sorted_sizes(seed):
+    rng = random.Random(seed)
+    index = day7.SizeIndex([(rng.randrange(1000), number) for number in range(20)])
+    entries = sorted(entry for bucket in index.buckets for entry in bucket)
+
+    for number in range(20, 500):
+        action = rng.random()
+        if action < 0.2 and entries:
+            entry = entries.pop(rng.randrange(len(entries)))
+            index.remove(entry)
+        elif action < 0.6 and entries:
+            entry = entries.pop(rng.randrange(len(entries)))
+            new = (entry[0] + rng.randrange(1, 500), entry[1])
+            index.replace(entry, new)
+            entries.append(new)
+        else:
+            entry = (rng.randrange(1000), number)
+            index.add(entry)
+            entries.append(entry)
+
+        entries.sort()
+        assert len(index) == len(entries)
+        for limit in limits([size for size, _ in entries] or [0], rng):
+            assert index.total_at_most(limit) == sum(size for size, _ in entries if size <= limit)
+            assert index.smallest_at_least(limit) == next((entry for entry in entries if entry[0] >= limit), None)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_indexed_file_system_matches_file_system(seed):
+    rng = random.Random(seed)
+    transcript = "".join(terminal_output(TRANSCRIPT_SIZE, rng)).encode().splitlines()
+    indexed = day7.IndexedFileSystem()
+
+    for count, line in enumerate(transcript, start=1):
+        indexed.read(line)
+        if count % CHECK_INTERVAL and count < len(transcript):
+            continue
+
+        reference = day7.create_file_system(transcript[:count])
+        for limit in limits([directory.size for directory in reference.directories], rng):
+            assert indexed.total_at_most(limit) == reference.total_at_most(limit)
+            smallest, found = reference.smallest_at_least(limit), indexed.smallest_at_least(limit)
+            assert (found and found.size) == (smallest and smallest.size)
+
+    assert len(indexed.directories) > 10 * day7.BUCKET_SIZE
@@ -0,0 +1,100 @@
+# Advent of Code: Puzzle inputs with Windows line endings
+__author__ = "Matteo Golin"
+
+# Imports
+import importlib
+
+import pytest
+
+from aoc.inputs import BLANK_LINE, blocks, lines, open_input, read_span, spans
+from day6 import day6
+
+# Constants
+# The example from each puzzle whose parser splits the raw bytes itself, with the answers given for it
+EXAMPLES: dict[int, tuple[str, object, object]] = {
+    1: ("1000\n2000\n3000\n\n4000\n\n5000\n6000\n\n7000\n8000\n9000\n\n10000\n", 24000, 45000),
+    5: (
+        "    [D]    \n"
+        "[N] [C]    \n"
+        "[Z] [M] [P]\n"
+        " 1   2   3 \n"
+        "\n"
+        "move 1 from 2 to 1\n"
+        "move 3 from 1 to 3\n"
+        "move 2 from 2 to 1\n"
+        "move 1 from 1 to 2\n",
+        "CMZ",
+        "MCD",
+    ),
+    6: ("mjqjpqmgbljsphdztnvjfqwrcgsmlb\n", 7, 19),
+    7: (
+        "$ cd /\n$ ls\ndir a\n14848514 b.txt\n8504156 c.dat\ndir d\n$ cd a\n$ ls\ndir e\n29116 f\n2557 g\n"
+        "62596 h.lst\n$ cd e\n$ ls\n584 i\n$ cd ..\n$ cd ..\n$ cd d\n$ ls\n4060174 j\n8033020 d.log\n5626152 d.ext\n"
+        "7214296 k\n",
+        95437,
+        24933642,
+    ),
+    8: ("30373\n25512\n65332\n33549\n35390\n", 21, 8),
+    11: (
+        "Monkey 0:\n  Starting items: 79, 98\n  Operation: new = old * 19\n  Test: divisible by 23\n"
+        "    If true: throw to monkey 2\n    If false: throw to monkey 3\n\n"
+        "Monkey 1:\n  Starting items: 54, 65, 75, 74\n  Operation: new = old + 6\n  Test: divisible by 19\n"
+        "    If true: throw to monkey 2\n    If false: throw to monkey 0\n\n"
+        "Monkey 2:\n  Starting items: 79, 60, 97\n  Operation: new = old * old\n  Test: divisible by 13\n"
+        "    If true: throw to monkey 1\n    If false: throw to monkey 3\n\n"
+        "Monkey 3:\n  Starting items: 74\n  Operation: new = old + 3\n  Test: divisible by 17\n"
+        "    If true: throw to monkey 0\n    If false: throw to monkey 1\n",
+        10605,
+        2713310158,
+    ),
+    12: ("Sabqponm\nabcryxxl\naccszExk\nacctuvwj\nabdefghi\n", 31, 29),
+    13: (
+        "[1,1,3,1,1]\n[1,1,5,1,1]\n\n[[1],[2,3,4]]\n[[1],4]\n\n[9]\n[[8,7,6]]\n\n[[4,4],4,4]\n[[4,4],4,4,4]\n\n"
+        "[7,7,7,7]\n[7,7,7]\n\n[]\n[3]\n\n[[[]]]\n[[]]\n\n[1,[2,[3,[4,[5,6,7]]]],8,9]\n[1,[2,[3,[4,[5,6,0]]]],8,9]\n",
+        13,
+        140,
+    ),
+}
+
+
+def crlf(text: str) -> bytes:
+
+    """Returns the text encoded with Windows line endings."""
+
+    return text.replace("\n", "\r\n").encode()
+
+
+def test_records_follow_crlf():
+    source = crlf("a\nb\n\nc\nd\n")
+    with open_input(source) as buffer:
+        assert buffer is source  # Never translated as a whole
+        assert list(lines(buffer)) == [b"a", b"b", b"", b"c", b"d"]
+        assert list(blocks(buffer)) == [b"a\nb", b"c\nd"]
+        assert list(spans(buffer, BLANK_LINE, size=1)) == [(0, 8), (8, len(source))]
+        assert read_span(buffer, 0, 8) == b"a\nb\n\n"
+
+
+def test_records_follow_new_lines():
+    source = b"a\nb\n\nc\n"
+    with open_input(source) as buffer:
+        assert list(lines(buffer)) == [b"a", b"b", b"", b"c"]
+        assert list(blocks(buffer)) == [b"a\nb", b"c"]
+        assert read_span(buffer) is source
+
+
+@pytest.mark.parametrize("day", sorted(EXAMPLES))
+def test_crlf_example(day, tmp_path):
+    module = importlib.import_module(f"day{day}.day{day}")
+    example, part_1, part_2 = EXAMPLES[day]
+    path = tmp_path / "input.txt"
+    path.write_bytes(crlf(example))
+
+    for source in [example.encode(), crlf(example), str(path)]:
+        answers = module.solve(module.parse(source))
+        assert (answers.part_1, answers.part_2) == (part_1, part_2)
+
+
+def test_line_ending_is_not_a_signal_character():
+    for source in [b"aabcaabcabcabcabcabcabc\n", crlf("aabcaabcabcabcabcabcabc\n")]:
+        answers = day6.solve(day6.parse(source))
+        assert (answers.part_1, answers.part_2) == (None, None)